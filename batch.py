@@ -0,0 +1,309 @@
+"""Headless batch mode: grades a whole cohort of portal exports in parallel.
+
+Usage:
+    python batch.py exports/ --branch General --out results/
+    python batch.py "exports/*.json" --workers 8
+    python batch.py exports/ --cache results.sqlite   # skip students whose export is unchanged
+    python batch.py exports/ --cohort cohort.bin       # also collect every attempt for cohort statistics
+    python batch.py exports/ --branch auto             # mixed cohort: detect each student's branch
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from branch_detect import BranchIndex, branch_index
+from cohort_store import CohortStore, attempt_rows
+from gpa_core import (
+    AUTO_BRANCH,
+    CURRICULUM_BRANCHES,
+    CURRICULUMS_PATH,
+    calculate_cumulative_gpa,
+    calculate_semester_gpa,
+    load_branch_curriculum,
+    process_student_data,
+    progress_summary,
+    sort_semesters,
+)
+from portal_stream import PortalStreamError, stream_student_file
+from prereq_graph import PrerequisiteGraph
+from ranking import RankingIndex
+from renderers import FILE_EXTENSIONS, RENDERERS, render_report
+from result_cache import DEFAULT_MAX_BYTES, ResultCache, curriculum_fingerprint, payload_key
+
+EXPORT_EXTENSIONS = ('.json', '.txt')
+UNCERTAIN_BRANCH = 0.5  # Detected branches below this confidence are listed in the summary
+TOP_STUDENTS = 10  # Students listed per branch and intake year in the summary's rankings
+
+# Per-worker state, set once by _init_worker so each task only ships a path.
+_curriculum = None
+_branch = None
+_out_dir = None
+_report_format = None
+_cache = None
+_curriculum_version = None
+_collect_attempts = False
+_branch_index = None
+_graphs = {}
+
+def _init_worker(curriculum, branch, out_dir, report_format=None, cache_path=None,
+                 cache_max_bytes=DEFAULT_MAX_BYTES, collect_attempts=False):
+    """With branch AUTO_BRANCH, `curriculum` holds every branch's curriculum keyed by branch."""
+    global _curriculum, _branch, _out_dir, _report_format, _graphs, _cache, _curriculum_version
+    global _collect_attempts, _branch_index
+    _curriculum, _branch, _out_dir, _report_format = curriculum, branch, out_dir, report_format
+    _collect_attempts = collect_attempts
+    _branch_index = BranchIndex(curriculum) if branch == AUTO_BRANCH else None
+    curricula = curriculum if _branch_index else {branch: curriculum}
+    _graphs = {b: PrerequisiteGraph(c) for b, c in curricula.items()} if report_format else {}
+    _cache = ResultCache(cache_path, cache_max_bytes) if cache_path else None
+    _curriculum_version = curriculum_fingerprint(curriculum) if cache_path else None
+
+def _cache_key(student_response):
+    """Reads a streamed studentProgress into a list and returns the student's cache key."""
+    progress = student_response.get('studentProgress')
+    if progress is not None and not isinstance(progress, list):
+        student_response['studentProgress'] = list(progress)
+    return payload_key(student_response, _branch, _curriculum_version, _report_format, _collect_attempts)
+
+def expand_inputs(inputs):
+    """Expands directories and glob patterns into a sorted list of export files."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in os.listdir(item):
+                if name.lower().endswith(EXPORT_EXTENSIONS):
+                    paths.append(os.path.join(item, name))
+        else:
+            paths.extend(p for p in glob.glob(item) if os.path.isfile(p))
+    return sorted(set(paths))
+
+def build_student_result(student_response, semesters, passed_courses, highest_level):
+    """Builds the machine-readable result for one processed student."""
+    gpa, total_hours = calculate_cumulative_gpa(semesters)
+    return {
+        'student_code': student_response.get('StudentCode', ''),
+        'cumulative_gpa': round(gpa, 4),
+        'total_hours': total_hours,
+        'highest_level': highest_level,
+        'semesters': [
+            {
+                'semester_id': sem_id,
+                'year': sem.year_str,
+                'name': sem.semester_name,
+                'gpa': round(calculate_semester_gpa(sem), 4),
+                'hours': sem.total_hours,
+            }
+            for sem_id, sem in sort_semesters(semesters)
+        ],
+        'passed_courses': sorted(passed_courses),
+    }
+
+def _grade_student(student_response):
+    key = None
+    try:
+        if _cache:
+            key = _cache_key(student_response)
+            result = _cache.get(key)
+            if result is not None:
+                result['cached'] = True
+                return result
+        branch, curriculum, detection = _branch, _curriculum, None
+        if _branch_index:
+            detection = _branch_index.detect(student_response)
+            branch = detection['branch']
+            curriculum = _branch_index.curricula[branch]
+        semesters, passed, level, error = process_student_data(student_response, curriculum, branch)
+    except PortalStreamError:
+        raise  # The file itself is broken; grade_file reports it
+    except (AttributeError, KeyError, IndexError, TypeError, ValueError) as exc:
+        return {'error': f"Error: Could not process student data: {exc}"}
+    if error:
+        return {'error': error}
+    result = build_student_result(student_response, semesters, passed, level)
+    if detection:
+        result['branch'] = branch
+        result['branch_confidence'] = detection['confidence']
+    if _report_format:
+        buffer = io.StringIO()
+        render_report(_report_format, buffer, semesters, progress_summary(curriculum, passed, _graphs[branch]),
+                      f"Academic Report {result['student_code']}".strip())
+        result['report'] = buffer.getvalue()
+    if _collect_attempts:
+        result['attempts'] = attempt_rows(semesters)
+    if key:
+        _cache.put(key, result)
+        result['cached'] = False
+    return result
+
+def grade_file(path):
+    """Grades every student in one export and writes their results.
+
+    Records are streamed straight into process_student_data, so memory stays
+    bounded by one student even for archive exports holding many.
+    """
+    results = []
+    try:
+        for student_response in stream_student_file(path):
+            results.append(_grade_student(student_response))
+    except OSError as exc:
+        results.append({'error': f"Error: Could not read '{path}': {exc.strerror}"})
+    except PortalStreamError as exc:
+        results.append({'error': f"Error: Could not decode JSON in '{path}': {exc}"})
+    if not results:
+        results.append({'error': f"Error: No student data found in '{path}'."})
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for index, result in enumerate(results):
+        result['file'] = path
+        result.setdefault('branch', _branch)
+        report = result.pop('report', None)
+        if _out_dir:
+            name = stem if len(results) == 1 else f"{stem}_{index}"
+            # 'cached' and 'attempts' only feed the summary and cohort store
+            stored = {k: v for k, v in result.items() if k not in ('cached', 'attempts')}
+            with open(os.path.join(_out_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+                json.dump(stored, f, ensure_ascii=False, indent=2)
+            if report is not None:
+                ext = FILE_EXTENSIONS[_report_format]
+                with open(os.path.join(_out_dir, f"{name}.report.{ext}"), 'w', encoding='utf-8') as f:
+                    f.write(report)
+    return results
+
+def summarize(results, elapsed, workers):
+    """Aggregates per-student results into the batch summary."""
+    graded = [r for r in results if not r.get('error')]
+    gpas = [r['cumulative_gpa'] for r in graded if r['total_hours'] > 0]
+    summary = {
+        'students': len(results),
+        'graded': len(graded),
+        'failed': [{'file': r['file'], 'error': r['error']} for r in results if r.get('error')],
+        'mean_gpa': round(sum(gpas) / len(gpas), 4) if gpas else 0,
+        'workers': workers,
+        'elapsed_seconds': round(elapsed, 3),
+        'students_per_second': round(len(results) / elapsed, 2) if elapsed > 0 else 0,
+    }
+    if any('cached' in r for r in graded):
+        hits = sum(1 for r in graded if r.get('cached'))
+        summary['cache'] = {'hits': hits, 'misses': len(graded) - hits}
+    if any('branch_confidence' in r for r in graded):
+        detected = {}
+        for r in graded:
+            detected[r['branch']] = detected.get(r['branch'], 0) + 1
+        summary['detected_branches'] = detected
+        summary['uncertain_branch'] = [r['file'] for r in graded if r.get('branch_confidence', 1.0) < UNCERTAIN_BRANCH]
+    summary['rankings'] = cohort_rankings(graded)
+    return summary
+
+def cohort_rankings(graded, top=TOP_STUDENTS):
+    """Ranks graded students by cumulative GPA within each branch and intake year."""
+    index = RankingIndex()
+    for result in graded:
+        if result['total_hours'] > 0 and result['student_code']:
+            index.update(result['student_code'], result['branch'], result['cumulative_gpa'])
+    return [
+        {
+            'branch': branch,
+            'intake_year': year,
+            'students': len(cohort),
+            'top': [{'student_code': code, 'cumulative_gpa': gpa, 'rank': rank}
+                    for code, gpa, rank in cohort.top(top)],
+        }
+        for (branch, year), cohort in sorted(index.cohorts.items(), key=lambda kv: (kv[0][0], kv[0][1] or 0))
+        if len(cohort)
+    ]
+
+def run_batch(paths, curriculum, branch, out_dir=None, workers=None, report_format=None,
+              cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES, cohort_path=None):
+    """Grades every path across a process pool and returns (results, summary).
+
+    With report_format (see renderers.RENDERERS) each student also gets a rendered report.
+    With cache_path, processed students are looked up in and added to a ResultCache there.
+    With cohort_path, every attempt is collected into a CohortStore saved there.
+    With branch AUTO_BRANCH, `curriculum` maps every branch to its curriculum and each
+    student is graded against the branch detected from their records.
+    """
+    workers = workers or os.cpu_count() or 1
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(curriculum, branch, out_dir, report_format, cache_path, cache_max_bytes,
+                     cohort_path is not None)
+        try:
+            per_file = [grade_file(p) for p in paths]
+        finally:
+            if _cache:
+                _cache.close()
+    else:
+        # Large chunks keep IPC overhead low; a few chunks per worker keep the tail short.
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(curriculum, branch, out_dir, report_format,
+                                           cache_path, cache_max_bytes, cohort_path is not None)) as pool:
+            per_file = list(pool.map(grade_file, paths, chunksize=chunksize))
+    results = [result for file_results in per_file for result in file_results]
+    if cohort_path:
+        store = CohortStore()
+        for result in results:
+            rows = result.pop('attempts', None)
+            if rows is not None:
+                store.add_rows(result['student_code'], rows)
+        store.save(cohort_path)
+    summary = summarize(results, time.perf_counter() - start, workers)
+
+    if out_dir:
+        with open(os.path.join(out_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return results, summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade a cohort of student portal exports without prompts.")
+    parser.add_argument('inputs', nargs='+', help="Export files, directories, or glob patterns.")
+    parser.add_argument('--branch', choices=CURRICULUM_BRANCHES + (AUTO_BRANCH,), default="General",
+                        help=f"Branch of every student, or '{AUTO_BRANCH}' to detect each student's branch.")
+    parser.add_argument('--curriculums', default=CURRICULUMS_PATH, help="Path to Curriculums.json.")
+    parser.add_argument('--out', default='batch_results', help="Directory for per-student results and summary.json.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument('--report', choices=sorted(RENDERERS), default=None,
+                        help="Also write a rendered report per student in this format.")
+    parser.add_argument('--cache', default=None,
+                        help="SQLite file caching processed students across runs (default: no cache).")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Maximum size of the cached results in MiB.")
+    parser.add_argument('--cohort', default=None,
+                        help="Also save every attempt to this cohort store (see cohort_store.py).")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Error: No export files matched the given inputs.")
+        return 1
+
+    if args.branch == AUTO_BRANCH:
+        curriculum = branch_index(args.curriculums).curricula
+    else:
+        curriculum = load_branch_curriculum(args.branch, args.curriculums)
+    _, summary = run_batch(paths, curriculum, args.branch, args.out, args.workers, args.report,
+                           args.cache, args.cache_size * 1024 * 1024, args.cohort)
+
+    print(f"Graded {summary['graded']}/{summary['students']} students in {summary['elapsed_seconds']}s "
+          f"({summary['students_per_second']} students/sec, {summary['workers']} workers).")
+    if args.cohort:
+        print(f"Cohort store saved to {args.cohort}.")
+    if 'cache' in summary:
+        print(f"Cache: {summary['cache']['hits']} hits, {summary['cache']['misses']} misses.")
+    if 'detected_branches' in summary:
+        print("Detected branches: " + ", ".join(f"{branch} {n}" for branch, n in summary['detected_branches'].items()))
+        for path in summary['uncertain_branch']:
+            print(f"  {path}: branch uncertain, check the result.")
+    for failure in summary['failed']:
+        print(f"  {failure['file']}: {failure['error']}")
+    return 0 if not summary['failed'] else 2
+
+if __name__ == "__main__":
+    raise SystemExit(main())
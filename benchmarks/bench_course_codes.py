@@ -0,0 +1,80 @@
+"""Compares the course-code table against per-attempt normalization on a dual-keyed curriculum.
+
+Usage:
+    python benchmarks/bench_course_codes.py --students 2000 --branch "Software Engineering"
+
+Reports the flat curriculum's size (keys, dict bytes, pickled bytes) with and
+without the dashed duplicate keys, and the time to resolve every attempt's
+'crscode' to its canonical code and curriculum entry both ways.
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gpa_core import (  # noqa: E402
+    CURRICULUM_BRANCHES,
+    CourseCodeTable,
+    dashed_course_code,
+    load_branch_curriculum,
+    normalize_course_code,
+)
+from synthetic import synthetic_cohort  # noqa: E402
+
+def legacy_curriculum(curriculum):
+    """The previous flat layout: every code also keyed by its dashed spelling."""
+    flat = {}
+    for code, data in curriculum.items():
+        flat[code] = data
+        if '-' not in code:
+            flat[dashed_course_code(code)] = data
+    return flat
+
+def legacy_resolve(crscodes, curriculum, branch):
+    get = curriculum.get
+    return [(code, get(code)) for code in (normalize_course_code(c, branch) for c in crscodes)]
+
+def table_resolve(crscodes, table):
+    resolve = table.resolve
+    return [resolve(c) for c in crscodes]
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--branch', choices=CURRICULUM_BRANCHES, default="Software Engineering")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    curriculum = load_branch_curriculum(args.branch)
+    legacy = legacy_curriculum(curriculum) if args.branch == "Software Engineering" else curriculum
+    print(f"{'curriculum':<12} {'keys':>6} {'dict bytes':>11} {'pickled bytes':>14}")
+    for name, flat in (("dual-keyed", legacy), ("canonical", curriculum)):
+        print(f"{name:<12} {len(flat):>6} {sys.getsizeof(flat):>11,} "
+              f"{len(pickle.dumps(flat, pickle.HIGHEST_PROTOCOL)):>14,}")
+
+    crscodes = [record['crscode'] for _, payload in synthetic_cohort(args.students, args.branch, 0, curriculum)
+                for record in payload['studentProgress']]
+    start = time.perf_counter()
+    table = CourseCodeTable(curriculum, args.branch)
+    build = time.perf_counter() - start
+    assert table_resolve(crscodes, table) == legacy_resolve(crscodes, legacy, args.branch)
+
+    old = best_of(lambda: legacy_resolve(crscodes, legacy, args.branch), args.repeat)
+    new = best_of(lambda: table_resolve(crscodes, table), args.repeat)
+    print(f"\nResolving {len(crscodes):,} crscodes ({args.branch}); table built once in {build * 1e3:.2f}ms")
+    print(f"  normalize + lookup: {old * 1e3:8.2f}ms ({len(crscodes) / old:,.0f}/s)")
+    print(f"  code table:         {new * 1e3:8.2f}ms ({len(crscodes) / new:,.0f}/s)  {old / new:.2f}x")
+
+if __name__ == "__main__":
+    main()
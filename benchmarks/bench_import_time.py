@@ -0,0 +1,56 @@
+"""Measures how long each entry module takes to import in a fresh interpreter.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --repeat 30 --modules gpa_core batch
+
+Each module is imported by a new `python -c` process; the best of --repeat runs,
+less the best time of an empty interpreter, is its import cost. The 'eager UI'
+row imports the core together with questionary and rich, which is what importing
+gpa_calculator cost before those were loaded lazily. The last column lists the
+UI packages an import pulls in (there should be none for headless modules).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ('gpa_core', 'gpa_calculator', 'batch', 'server', 'watch', 'renderers')
+UI_PACKAGES = ('questionary', 'prompt_toolkit', 'rich', 'pygments')
+EAGER_UI = "import gpa_core, questionary, rich.console, rich.table, rich.panel"
+
+def best_of(code, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def ui_packages(code):
+    """The UI packages present in sys.modules after running code."""
+    probe = (f"{code}\nimport json, sys\n"
+             f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & {set(UI_PACKAGES)!r})))")
+    out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', nargs='+', default=list(DEFAULT_MODULES))
+    parser.add_argument('--repeat', type=int, default=15)
+    args = parser.parse_args(argv)
+
+    startup = best_of('pass', args.repeat)
+    print(f"Interpreter startup: {startup * 1e3:.1f}ms (subtracted below)\n")
+    print(f"{'import':<16} {'ms':>8}  UI packages loaded")
+    rows = [(name, f"import {name}") for name in args.modules] + [("eager UI", EAGER_UI)]
+    for name, code in rows:
+        cost = best_of(code, args.repeat) - startup
+        print(f"{name:<16} {cost * 1e3:8.1f}  {', '.join(ui_packages(code)) or '-'}")
+
+if __name__ == "__main__":
+    main()
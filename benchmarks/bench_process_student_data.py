@@ -0,0 +1,182 @@
+"""Compares process_student_data against the previous dict-per-attempt implementation.
+
+Usage:
+    python benchmarks/bench_process_student_data.py --records 200000 --branch General
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gpa_core import (  # noqa: E402
+    get_grade_info,
+    get_grade_info_software_eng,
+    load_branch_curriculum,
+    process_student_data,
+)
+
+def legacy_process_student_data(student_response, curriculum, branch=None):
+    """The implementation before slotted attempts: one dict per attempt, sort, copy."""
+    start_year_match = re.search(r'^(\d{2})', student_response.get('StudentCode', ''))
+    start_year = int(f"20{start_year_match.group(1)}") if start_year_match else 2020
+    level_map = {"First": 1, "Second": 2, "Third": 3, "Fourth": 4}
+    semesters = {}
+    all_attempts = defaultdict(list)
+    highest_level = 0
+    for course in student_response.get('studentProgress', []):
+        code = course.get('crscode', '|').split('|')[0]
+        if branch == "Software Engineering":
+            code = code.replace('-', '')
+        is_uni_course = code.startswith('UNI-')
+        course_info = curriculum.get(code)
+        if not course_info:
+            if is_uni_course:
+                course_info = {
+                    'name': (course.get('crsName', '') + '|').split('|')[1] or (course.get('crsName', '') + '|').split('|')[0],
+                    'credit_hours': float(course.get('creditv') or 0),
+                    'level': 'University Req.',
+                    'prerequisites': []
+                }
+            else:
+                continue
+        semester_id = course.get('yearsem')
+        if semester_id not in semesters:
+            semesters[semester_id] = {
+                'courses': [], 'total_points': 0.0, 'total_hours': 0.0,
+                'year_str': '', 'semester_name': course.get('semesterCourse', '|').split('|')[1]
+            }
+        is_finished = False
+        degree_display = "In Progress"
+        letter_grade = "-"
+        status = "In Progress"
+        grade_points = 0.0
+        if is_uni_course:
+            grade_n = course.get('gradeN')
+            if grade_n is not None and grade_n != '':
+                is_finished = True
+                if 'P' in grade_n.upper():
+                    degree_display, letter_grade, status = "Passed", "P", "Passed"
+                elif 'BF' in grade_n.upper():
+                    deg_val = course.get('Degree', '')
+                    degree_display = deg_val if deg_val not in (None, '', 'BF', 'bf') else 'BF'
+                    letter_grade, status = "BF", "Failed"
+                else:
+                    degree_display, letter_grade, status = "Fail", "F", "Failed"
+        else:
+            degree_str = course.get('Degree', '')
+            grade_n = course.get('gradeN', '')
+            if isinstance(grade_n, str) and 'BF' in grade_n.upper():
+                is_finished = True
+                degree_display = degree_str if degree_str not in (None, '', 'BF', 'bf') else 'BF'
+                letter_grade, status = "BF", "Failed"
+            elif isinstance(degree_str, str) and degree_str.strip().upper() == 'BF':
+                is_finished = True
+                degree_display, letter_grade, status = "BF", "BF", "Failed"
+            else:
+                try:
+                    degree_val = float(degree_str)
+                    is_finished = True
+                    if branch == "Software Engineering":
+                        grade_info = get_grade_info_software_eng(degree_val)
+                    else:
+                        grade_info = get_grade_info(degree_val)
+                    letter_grade = grade_info['letter']
+                    grade_points = grade_info['points']
+                    degree_display = degree_str
+                    status = "Passed" if grade_points > 0 else "Failed"
+                except (ValueError, TypeError):
+                    pass
+        all_attempts[code].append({
+            'semester_id': semester_id, 'name': course_info['name'], 'code': code,
+            'degree': degree_display, 'letter': letter_grade, 'hours': course_info['credit_hours'],
+            'status': status, 'is_finished': is_finished, 'grade_points': grade_points,
+            'is_uni_course': is_uni_course, 'course_info': course_info
+        })
+        level_ord = level_map.get(course_info.get('level', 'Unknown').split(' ')[0], 0)
+        if level_ord > 0:
+            highest_level = max(highest_level, level_ord)
+            year = start_year + level_ord - 1
+            semesters[semester_id]['year_str'] = f"{year}/{year + 1}"
+    passed_courses = set()
+    for code, attempts in all_attempts.items():
+        attempts_sorted = sorted(attempts, key=lambda x: x['semester_id'])
+        for att in attempts_sorted:
+            if not att['is_uni_course'] and not att['is_finished'] and att['status'] == 'In Progress':
+                semesters[att['semester_id']]['courses'].append(att.copy())
+            elif att['is_finished'] or att['status'] != 'In Progress':
+                semesters[att['semester_id']]['courses'].append(att.copy())
+        for att in reversed(attempts_sorted):
+            if att['is_finished'] and att['status'] == 'Passed':
+                passed_courses.add(code)
+                break
+        latest_finished = None
+        for att in reversed(attempts_sorted):
+            if att['is_finished'] and not att['is_uni_course']:
+                latest_finished = att
+                break
+        if latest_finished:
+            sem = semesters[latest_finished['semester_id']]
+            sem['total_points'] += latest_finished['grade_points'] * latest_finished['hours']
+            sem['total_hours'] += latest_finished['hours']
+    return semesters, passed_courses, highest_level, None
+
+def synthetic_transcript(curriculum, records, seed=0):
+    """Builds a portal payload with `records` attempts spread over the curriculum's courses."""
+    rng = random.Random(seed)
+    codes = list(curriculum)
+    progress = []
+    for i in range(records):
+        code = rng.choice(codes)
+        info = curriculum[code]
+        degree = rng.choice([str(rng.randint(20, 100)), str(rng.randint(50, 100)), 'BF', ''])
+        progress.append({
+            'crscode': f"{code}|{i}",
+            'crsName': f"|{info['name']}",
+            'creditv': str(info['credit_hours']),
+            'yearsem': 20200 + 10 * (i % 40) + 1 + i % 2,
+            'semesterCourse': f"|{'First' if i % 2 == 0 else 'Second'} Semester",
+            'Degree': degree,
+            'gradeN': 'BF' if degree == 'BF' else '',
+        })
+    return {'StudentCode': '2012345', 'studentProgress': progress}
+
+def measure(func, *args, repeat=3):
+    """Returns (best wall time in seconds, peak traced memory in bytes) for func(*args)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=200000, help="Attempts in the synthetic transcript.")
+    parser.add_argument('--branch', choices=("General", "Software Engineering"), default="General")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    curriculum = load_branch_curriculum(args.branch)
+    payload = synthetic_transcript(curriculum, args.records)
+    print(f"{args.records} attempts, {args.branch} branch")
+    rows = []
+    for label, func in (("legacy", legacy_process_student_data), ("current", process_student_data)):
+        seconds, peak = measure(func, payload, curriculum, args.branch, repeat=args.repeat)
+        rows.append((label, seconds, peak))
+        print(f"  {label:<8} {seconds * 1000:9.1f} ms  {peak / 2**20:8.1f} MiB peak  "
+              f"{args.records / seconds:12,.0f} attempts/s")
+    (_, old_s, old_peak), (_, new_s, new_peak) = rows
+    print(f"  speedup {old_s / new_s:.2f}x, peak memory {new_peak / old_peak:.0%} of legacy")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Load test for server.py: concurrent keep-alive clients posting synthetic students.
+
+Usage:
+    python benchmarks/load_test.py --spawn --requests 2000 --concurrency 32
+    python benchmarks/load_test.py --port 8765 --branch "Software Engineering"
+
+With --spawn a local server is started on a free port for the duration of the
+run; otherwise an already running instance is used. Reports throughput and the
+latency percentiles of every request, measured from the first byte sent to the
+last byte of the response.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import synthetic_cohort  # noqa: E402
+
+PERCENTILES = (50, 90, 95, 99)
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _client(host, port, requests, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for request in requests:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+def build_requests(host, port, count, students, branch, seed):
+    """Pre-encodes `count` POST /grade requests cycling through synthetic students."""
+    cohort = synthetic_cohort(students, branch, seed)
+    requests = []
+    for student_branch, payload in cohort:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        requests.append(
+            f"POST /grade?branch={quote(student_branch)} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+    return [requests[i % len(requests)] for i in range(count)]
+
+async def run_load(host, port, requests, concurrency):
+    latencies = []
+    statuses = {}
+    shares = [requests[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, share, latencies, statuses) for share in shares if share))
+    return time.perf_counter() - start, sorted(latencies), statuses
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _wait_for_server(host, port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited before it started listening.")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not start listening on {host}:{port} within {timeout}s.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure server.py latency under concurrent load.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--spawn', action='store_true', help="Start a local server for the run.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for a spawned server.")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--students', type=int, default=100, help="Distinct synthetic students to cycle through.")
+    parser.add_argument('--branch', default=None, help="Branch for every student (default: both).")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.spawn:
+        args.port = _free_port()
+        command = [sys.executable, os.path.join(ROOT, 'server.py'), '--host', args.host, '--port', str(args.port)]
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        if process:
+            _wait_for_server(args.host, args.port, process)
+        requests = build_requests(args.host, args.port, args.requests, args.students, args.branch, args.seed)
+        elapsed, latencies, statuses = asyncio.run(run_load(args.host, args.port, requests, args.concurrency))
+    finally:
+        if process:
+            # SIGINT lets the server shut its worker pool down; kill it only if that stalls
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    print(f"{len(latencies)} requests, concurrency {args.concurrency}, {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} req/s)")
+    print("Status codes: " + ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items())))
+    print("Latency (ms): " + "  ".join(f"p{p} {percentile(latencies, p) * 1000:.2f}" for p in PERCENTILES)
+          + f"  max {latencies[-1] * 1000:.2f}")
+    return 0 if set(statuses) == {200} else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
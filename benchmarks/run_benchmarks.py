@@ -0,0 +1,176 @@
+"""Benchmark suite for the GPA calculator, with stored baselines to flag regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # run and compare to baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline    # record a new baseline
+    python benchmarks/run_benchmarks.py --students 2000 --only process
+
+Each benchmark reports the best wall time over --repeat runs, throughput in
+items/sec, and peak traced memory from one extra run under tracemalloc. Runs are
+compared with the baseline per item, so a different --students size still lines
+up. Baselines are machine specific: regressions are only reported, unless
+--strict is given against a baseline recorded on the same machine.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console  # noqa: E402
+
+from gpa_calculator import (  # noqa: E402
+    CURRICULUMS_PATH,
+    display_all_semesters,
+    display_cumulative_gpa,
+    display_progress_report,
+    display_semester,
+    flatten_se_curriculum,
+    get_grade_info,
+    get_grade_info_software_eng,
+    grade_degrees,
+    load_branch_curriculum,
+    load_curriculums,
+    process_student_data,
+)
+from prereq_graph import PrerequisiteGraph  # noqa: E402
+from synthetic import synthetic_cohort  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+MACHINE_KEY = '_machine'
+
+def measure(func, repeat):
+    """Returns (best seconds, peak traced bytes) for func()."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def build_benchmarks(students, degrees, seed):
+    """Returns [(name, items, func)] covering loading, grading, processing and display."""
+    curricula = {branch: load_branch_curriculum(branch) for branch in ("General", "Software Engineering")}
+    raw_se = load_curriculums(CURRICULUMS_PATH)["SoftwareEngineering"]["curriculum"]
+    cohorts = {branch: synthetic_cohort(students, branch, seed, curricula[branch]) for branch in curricula}
+    rng = random.Random(seed)
+    scores = [rng.uniform(0, 100) for _ in range(degrees)]
+
+    # One processed student per branch drives the display benchmarks
+    sample = {}
+    for branch, cohort in cohorts.items():
+        semesters, passed, _, _ = process_student_data(cohort[0][1], curricula[branch], branch)
+        sample[branch] = (semesters, passed, PrerequisiteGraph(curricula[branch]))
+    console = Console(file=io.StringIO(), width=120)
+
+    def process_cohort(branch):
+        curriculum, cohort = curricula[branch], cohorts[branch]
+        return lambda: [process_student_data(payload, curriculum, branch) for _, payload in cohort]
+
+    def display(branch, func):
+        semesters, passed, graph = sample[branch]
+        def run():
+            console.file = io.StringIO()
+            func(semesters, passed, graph, curricula[branch])
+        return run
+
+    benchmarks = [
+        ("load_curriculums", 1, lambda: load_curriculums(CURRICULUMS_PATH)),
+        ("flatten_se_curriculum", 1, lambda: flatten_se_curriculum(raw_se)),
+        ("load_branch_curriculum[cached]", 1, lambda: load_branch_curriculum("Software Engineering")),
+        ("get_grade_info", degrees, lambda: [get_grade_info(s) for s in scores]),
+        ("get_grade_info_software_eng", degrees, lambda: [get_grade_info_software_eng(s) for s in scores]),
+        ("grade_degrees[General]", degrees, lambda: grade_degrees(scores, "General")),
+        ("grade_degrees[Software Engineering]", degrees, lambda: grade_degrees(scores, "Software Engineering")),
+    ]
+    for branch in curricula:
+        benchmarks.append((f"process_student_data[{branch}]", students, process_cohort(branch)))
+    for branch in curricula:
+        semesters = sample[branch][0]
+        benchmarks += [
+            (f"display_semester[{branch}]", 1, display(branch, lambda s, p, g, c: display_semester(
+                console, next(iter(s.values())), "Semester") if s else None)),
+            (f"display_all_semesters[{branch}]", len(semesters), display(branch, lambda s, p, g, c: display_all_semesters(console, s))),
+            (f"display_cumulative_gpa[{branch}]", 1, display(branch, lambda s, p, g, c: display_cumulative_gpa(console, s))),
+            (f"display_progress_report[{branch}]", 1, display(branch, lambda s, p, g, c: display_progress_report(console, c, p, g))),
+        ]
+    return benchmarks
+
+def per_item_ratio(result, base):
+    """This run's time per item over the baseline's, so different --students sizes compare."""
+    return (result['seconds'] / result['items']) / (base['seconds'] / base['items'])
+
+def compare(results, baseline, tolerance):
+    """Returns the names whose time per item regressed by more than tolerance against baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and per_item_ratio(result, base) > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+def machine_id():
+    """Identifies the machine and interpreter a baseline was recorded on."""
+    return f"{platform.node()} {platform.machine()} {platform.python_implementation()} {platform.python_version()}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the GPA calculator benchmark suite.")
+    parser.add_argument('--students', type=int, default=500, help="Synthetic students per branch.")
+    parser.add_argument('--degrees', type=int, default=100000, help="Degrees per grading benchmark.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', default='', help="Run only benchmarks whose name contains this text.")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline.")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown per item against the baseline before flagging (0.25 = 25%%).")
+    parser.add_argument('--strict', action='store_true',
+                        help="Exit non-zero on a regression (only meaningful against a baseline from this machine).")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    recorded_on = baseline.pop(MACHINE_KEY, None)
+    if baseline and recorded_on != machine_id():
+        print(f"Note: the baseline was recorded on {recorded_on or 'another machine'}; "
+              f"treat the 'vs base' column as indicative only.\n")
+
+    results = {}
+    print(f"{'benchmark':<46} {'time':>11} {'items/s':>13} {'peak':>10} {'vs base':>8}")
+    for name, items, func in build_benchmarks(args.students, args.degrees, args.seed):
+        if args.only not in name:
+            continue
+        seconds, peak = measure(func, args.repeat)
+        results[name] = {'seconds': seconds, 'items': items, 'peak_bytes': peak}
+        base = baseline.get(name)
+        ratio = f"{per_item_ratio(results[name], base):.2f}x" if base else "-"
+        print(f"{name:<46} {seconds * 1000:9.3f}ms {items / seconds:13,.0f} {peak / 1024:8.0f}KiB {ratio:>8}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        baseline[MACHINE_KEY] = machine_id()
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name in regressions:
+        print(f"REGRESSION: {name} is more than {args.tolerance:.0%} slower per item than the baseline")
+    return 1 if regressions and args.strict and recorded_on == machine_id() else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""Synthetic student portal payloads generated from Curriculums.json.
+
+Students walk the curriculum level by level: each term they register the courses
+planned for it, some fail (numerically or with BF) and are retaken the following
+term, university requirement (UNI-) courses are graded pass/fail, and the
+current term is left in progress. Payloads use the same field layout as the
+portal's getJCI response.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gpa_core import CURRICULUM_BRANCHES, load_branch_curriculum  # noqa: E402
+
+LEVELS = ("First Level", "Second Level", "Third Level", "Fourth Level")
+TERMS = ("1st Semester", "2nd Semester")
+TERM_NAMES = {"1st Semester": "First Semester", "2nd Semester": "Second Semester"}
+UNI_COURSES = (("UNI-101", "University English"), ("UNI-102", "Human Rights"),
+               ("UNI-103", "Computer Skills"), ("UNI-104", "Quality and Anti-corruption"))
+
+def _courses_by_term(curriculum):
+    """Groups curriculum courses by (level, semester)."""
+    plan = {}
+    for code, data in curriculum.items():
+        plan.setdefault((data['level'], data['semester']), []).append((code, data))
+    return plan
+
+def _record(rng, code, name, hours, year, term_index, degree, grade_n, dashed=False):
+    if dashed and '-' not in code and len(code) > 3:
+        code = code[:3] + '-' + code[3:]
+    term = TERMS[term_index]
+    return {
+        'crscode': f"{code}|{rng.randint(1000, 9999)}",
+        'crsName': f"|{name}",
+        'creditv': str(hours),
+        'yearsem': year * 10 + term_index + 1,
+        'semesterCourse': f"{term_index + 1}|{TERM_NAMES[term]}",
+        'Degree': degree,
+        'gradeN': grade_n,
+    }
+
+def _grade(rng, fail_rate, bf_rate):
+    roll = rng.random()
+    if roll < bf_rate:
+        return 'BF', 'BF'
+    if roll < bf_rate + fail_rate:
+        return str(rng.randint(20, 49)), 'F'
+    return str(rng.randint(50, 100)), ''
+
+def synthetic_student(curriculum, branch="General", student_index=0, seed=0,
+                      fail_rate=0.08, bf_rate=0.02, retake_rate=0.9, uni_courses=True,
+                      terms=None):
+    """Generates one student's portal payload.
+
+    `terms` is the number of terms taken (default: random, 2 to 8); the last one
+    is in progress. Failed courses are retaken next term with probability retake_rate.
+    """
+    rng = random.Random(f"{seed}:{branch}:{student_index}")
+    intake = 2018 + rng.randrange(5)
+    plan = _courses_by_term(curriculum)
+    terms = terms or rng.randint(2, 8)
+    dashed = branch == "Software Engineering"
+
+    progress = []
+    retakes = []
+    for t in range(terms):
+        level, term_index = LEVELS[min(t // 2, 3)], t % 2
+        year = intake + t // 2
+        in_progress = t == terms - 1
+        taking = retakes + plan.get((level, TERMS[term_index]), [])
+        retakes = []
+        for code, data in taking:
+            if in_progress:
+                degree, grade_n = '', ''
+            else:
+                degree, grade_n = _grade(rng, fail_rate, bf_rate)
+                if grade_n in ('F', 'BF') and rng.random() < retake_rate:
+                    retakes.append((code, data))
+            progress.append(_record(rng, code, data['name'], data['credit_hours'], year, term_index,
+                                    degree, grade_n, dashed and rng.random() < 0.5))
+        if uni_courses and not dashed and t < len(UNI_COURSES):
+            code, name = UNI_COURSES[t]
+            grade_n = '' if in_progress else ('P' if rng.random() > fail_rate else 'F')
+            progress.append(_record(rng, code, name, 2, year, term_index, '', grade_n))
+
+    rng.shuffle(progress)
+    return {
+        'StudentCode': f"{intake % 100:02d}{student_index:05d}",
+        'StudentName': f"Student {student_index}",
+        'studentProgress': progress,
+    }
+
+def synthetic_cohort(students, branch="General", seed=0, curriculum=None, **options):
+    """Generates `students` payloads for one branch (or a mix when branch is None).
+
+    `curriculum` may be passed to skip loading it, for a single branch only.
+    Returns a list of (branch, payload) pairs.
+    """
+    curricula = {}
+    cohort = []
+    for i in range(students):
+        student_branch = branch or CURRICULUM_BRANCHES[i % len(CURRICULUM_BRANCHES)]
+        if student_branch not in curricula:
+            curricula[student_branch] = curriculum or load_branch_curriculum(student_branch)
+        cohort.append((student_branch, synthetic_student(curricula[student_branch], student_branch,
+                                                         i, seed, **options)))
+    return cohort
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic cohort of portal exports to a directory.")
+    parser.add_argument('out', help="Output directory (one JSON export per student).")
+    parser.add_argument('--students', type=int, default=100)
+    parser.add_argument('--branch', choices=CURRICULUM_BRANCHES, default=None,
+                        help="Branch for every student (default: alternate both branches).")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    for i, (_, payload) in enumerate(synthetic_cohort(args.students, args.branch, args.seed)):
+        with open(os.path.join(args.out, f"student_{i:05d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Detects a student's branch from their records, against every curriculum at once.
+
+An inverted index maps each spelling of every curriculum course code to the set
+of branches (a bitmask) that teach it, so one pass over 'studentProgress' counts
+how many records each branch recognises. University-wide requirements (UNI
+courses) are taken in every branch and are left out of the count.
+
+The confidence is the winning branch's lead over the runner-up, as a share of
+the records considered: 1.0 when only one branch explains the transcript, 0.0
+when there is nothing to tell the branches apart (the first branch is then used).
+"""
+from gpa_core import CURRICULUM_BRANCHES, CURRICULUMS_PATH, CourseCodeTable, load_branch_curriculum
+
+def _is_university_course(code):
+    return code.replace('-', '').startswith('UNI')
+
+class BranchIndex:
+    """Inverted index from course code spelling to the branches whose curriculum has it."""
+
+    def __init__(self, curricula):
+        self.curricula = curricula
+        self.branches = tuple(curricula)
+        self.index = {}  # spelling -> bitmask over self.branches
+        for bit, (branch, curriculum) in enumerate(curricula.items()):
+            for spelling in CourseCodeTable(curriculum, branch).ids:
+                if not _is_university_course(spelling):
+                    self.index[spelling] = self.index.get(spelling, 0) | (1 << bit)
+
+    def detect(self, student_response):
+        """Returns {'branch', 'confidence', 'matches', 'records'} for one student.
+
+        'matches' counts, per branch, the considered records its curriculum knows.
+        A streamed 'studentProgress' is read into a list so it can still be processed.
+        """
+        progress = student_response.get('studentProgress') or []
+        if not isinstance(progress, list):
+            progress = student_response['studentProgress'] = list(progress)
+        counts = [0] * len(self.branches)
+        records = 0
+        get = self.index.get
+        for course in progress:
+            code = (course.get('crscode') or '|').partition('|')[0]
+            if _is_university_course(code):
+                continue
+            records += 1
+            mask = get(code, 0)
+            bit = 0
+            while mask:
+                if mask & 1:
+                    counts[bit] += 1
+                mask >>= 1
+                bit += 1
+
+        ranked = sorted(range(len(self.branches)), key=lambda i: -counts[i])  # Stable: ties keep branch order
+        best = ranked[0]
+        runner_up = counts[ranked[1]] if len(ranked) > 1 else 0
+        return {
+            'branch': self.branches[best],
+            'confidence': round((counts[best] - runner_up) / records, 4) if records else 0.0,
+            'matches': dict(zip(self.branches, counts)),
+            'records': records,
+        }
+
+_indexes = {}
+
+def branch_index(source=CURRICULUMS_PATH, cache_dir=None):
+    """Returns the BranchIndex over every branch's curriculum, building it once per source."""
+    key = (source, cache_dir)
+    index = _indexes.get(key)
+    if index is None:
+        curricula = {branch: load_branch_curriculum(branch, source, cache_dir) for branch in CURRICULUM_BRANCHES}
+        index = _indexes[key] = BranchIndex(curricula)
+    return index
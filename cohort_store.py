@@ -0,0 +1,308 @@
+"""Columnar store of every graded attempt in a cohort, for per-course and per-semester statistics.
+
+Each attempt is one row across parallel typed arrays: student, course, semester,
+degree, letter, grade points, credit hours and status flags. Course codes,
+letters and student codes are interned to small integers, so a row costs 38
+bytes and no per-attempt objects. Statistics are computed by single passes over
+the columns (the standard library has no vector kernels, and a pass over
+compact arrays beats walking per-student dicts by a wide margin).
+
+The saved file is a short JSON header followed by the raw, 8-byte aligned
+column buffers. CohortStore.open memory-maps it and casts each column in place,
+so queries against a large cohort read only the pages they touch.
+
+Usage:
+    python cohort_store.py cohort.bin                  # per-course statistics
+    python cohort_store.py cohort.bin --semesters      # per-semester statistics
+    python cohort_store.py cohort.bin --course CSD230
+"""
+import argparse
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+MAGIC = b'GPACOHT1'
+FORMAT_VERSION = 1
+
+# Status flags, OR-ed into the 'flags' column
+FINISHED, PASSED, FAILED, BF, UNI = 1, 2, 4, 8, 16
+
+# (column, array typecode); degree is NaN when the attempt has no numeric degree
+COLUMNS = (
+    ('student', 'I'),
+    ('course', 'I'),
+    ('semester', 'i'),
+    ('degree', 'd'),
+    ('points', 'd'),
+    ('hours', 'd'),
+    ('letter', 'B'),
+    ('flags', 'B'),
+)
+
+def _degree_value(degree):
+    try:
+        return float(degree)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _semester_value(semester_id):
+    try:
+        return int(semester_id)
+    except (TypeError, ValueError):
+        return -1
+
+def attempt_rows(semesters):
+    """Flattens process_student_data semesters into JSON-friendly attempt rows.
+
+    Each row is [code, semester_id, degree, letter, points, hours, flags]. Rows can
+    be shipped between processes (or cached) and passed to CohortStore.add_rows.
+    """
+    rows = []
+    for semester_id, sem in semesters.items():
+        semester = _semester_value(semester_id)
+        for att in sem.courses:
+            flags = ((FINISHED if att.is_finished else 0) | (UNI if att.is_uni_course else 0)
+                     | (PASSED if att.status == 'Passed' else 0) | (FAILED if att.status == 'Failed' else 0)
+                     | (BF if att.letter == 'BF' else 0))
+            degree = _degree_value(att.degree)
+            rows.append([att.code, semester, None if degree != degree else degree,
+                         att.letter, att.grade_points, att.hours, flags])
+    return rows
+
+class CohortStore:
+    """Append-only columnar attempt table with interned codes; read-only when memory-mapped."""
+
+    def __init__(self):
+        self.codes = []
+        self.letters = []
+        self.students = []
+        self._code_ids = {}
+        self._letter_ids = {}
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self._mmap = None
+        self._view = None
+
+    def __len__(self):
+        return len(self.columns['course'])
+
+    def _intern(self, table, ids, value):
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(table)
+            table.append(value)
+        return index
+
+    def add_rows(self, student_code, rows):
+        """Appends one student's attempt rows (see attempt_rows)."""
+        if self._mmap is not None:
+            raise ValueError("A memory-mapped cohort store is read-only.")
+        student = len(self.students)
+        self.students.append(student_code)
+        cols = self.columns
+        code_ids, letter_ids = self._code_ids, self._letter_ids
+        for code, semester, degree, letter, points, hours, flags in rows:
+            course = code_ids.get(code)
+            if course is None:
+                course = self._intern(self.codes, code_ids, code)
+            letter_id = letter_ids.get(letter)
+            if letter_id is None:
+                letter_id = self._intern(self.letters, letter_ids, letter)
+            cols['student'].append(student)
+            cols['course'].append(course)
+            cols['semester'].append(semester)
+            cols['degree'].append(math.nan if degree is None else degree)
+            cols['points'].append(points)
+            cols['hours'].append(hours)
+            cols['letter'].append(letter_id)
+            cols['flags'].append(flags)
+
+    def add_student(self, student_code, semesters):
+        """Appends every attempt of one processed student."""
+        self.add_rows(student_code, attempt_rows(semesters))
+
+    def course_stats(self, code=None):
+        """Per-course statistics, keyed by course code (or just one course's dict).
+
+        For each course: attempts, distinct students, finished/passed/failed/BF and
+        in-progress counts, pass rate over finished attempts, retakes (attempts
+        beyond a student's first), mean numeric degree and the letter distribution
+        of finished attempts.
+        """
+        cols = self.columns
+        only = None
+        if code is not None:
+            only = self._code_ids.get(code)
+            if only is None:
+                raise KeyError(code)
+        n = len(self.codes)
+        attempts = [0] * n
+        finished = [0] * n
+        passed = [0] * n
+        failed = [0] * n
+        bf = [0] * n
+        degree_sum = [0.0] * n
+        degree_count = [0] * n
+        letters = [{} for _ in range(n)]
+        seen = set()
+        for student, course, degree, letter, flags in zip(cols['student'], cols['course'], cols['degree'],
+                                                          cols['letter'], cols['flags']):
+            if only is not None and course != only:
+                continue
+            attempts[course] += 1
+            seen.add((course, student))
+            if degree == degree:
+                degree_sum[course] += degree
+                degree_count[course] += 1
+            if flags & FINISHED:
+                finished[course] += 1
+                dist = letters[course]
+                dist[letter] = dist.get(letter, 0) + 1
+                if flags & PASSED:
+                    passed[course] += 1
+                elif flags & FAILED:
+                    failed[course] += 1
+                if flags & BF:
+                    bf[course] += 1
+        students = [0] * n
+        for course, _ in seen:
+            students[course] += 1
+
+        stats = {}
+        for i in (range(n) if only is None else (only,)):
+            if not attempts[i]:
+                continue
+            stats[self.codes[i]] = {
+                'attempts': attempts[i],
+                'students': students[i],
+                'finished': finished[i],
+                'passed': passed[i],
+                'failed': failed[i],
+                'bf': bf[i],
+                'in_progress': attempts[i] - finished[i],
+                'pass_rate': round(passed[i] / finished[i], 4) if finished[i] else None,
+                'retakes': attempts[i] - students[i],
+                'mean_degree': round(degree_sum[i] / degree_count[i], 2) if degree_count[i] else None,
+                'grade_distribution': {self.letters[k]: v for k, v in sorted(letters[i].items(),
+                                                                          key=lambda kv: self.letters[kv[0]])},
+            }
+        return stats if only is None else stats.get(code, {})
+
+    def semester_stats(self):
+        """Per-semester statistics keyed by semester id: attempts, students, pass rate and
+        the credit-weighted mean grade points of finished, graded (non-UNI) attempts."""
+        cols = self.columns
+        groups = {}
+        for student, semester, points, hours, flags in zip(cols['student'], cols['semester'], cols['points'],
+                                                           cols['hours'], cols['flags']):
+            group = groups.get(semester)
+            if group is None:
+                group = groups[semester] = [0, set(), 0, 0, 0.0, 0.0]
+            group[0] += 1
+            group[1].add(student)
+            if flags & FINISHED:
+                group[2] += 1
+                if flags & PASSED:
+                    group[3] += 1
+                if not flags & UNI:
+                    group[4] += points * hours
+                    group[5] += hours
+        return {
+            semester: {
+                'attempts': attempts,
+                'students': len(students),
+                'finished': finished,
+                'passed': passed,
+                'pass_rate': round(passed / finished, 4) if finished else None,
+                'mean_points': round(weighted / hours, 4) if hours else None,
+            }
+            for semester, (attempts, students, finished, passed, weighted, hours) in sorted(groups.items())
+        }
+
+    def save(self, path):
+        """Writes the header and the 8-byte aligned column buffers."""
+        layout = []
+        offset = 0
+        for name, typecode in COLUMNS:
+            nbytes = len(self.columns[name]) * array(typecode).itemsize
+            layout.append([name, typecode, offset, nbytes])
+            offset += (nbytes + 7) & ~7
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'byteorder': sys.byteorder,
+            'rows': len(self),
+            'codes': self.codes,
+            'letters': self.letters,
+            'students': self.students,
+            'columns': layout,
+        }, ensure_ascii=False).encode('utf-8')
+        start = (len(MAGIC) + 4 + len(header) + 7) & ~7
+        with open(path, 'wb') as f:
+            f.write(MAGIC + struct.pack('<I', len(header)) + header)
+            f.write(b'\0' * (start - f.tell()))
+            for (name, _, column_offset, nbytes) in layout:
+                f.write(b'\0' * (start + column_offset - f.tell()))
+                f.write(self.columns[name].tobytes())
+
+    @classmethod
+    def open(cls, path):
+        """Memory-maps a saved store; its columns are read-only views into the file."""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"'{path}' is not a cohort store.")
+        (header_len,) = struct.unpack_from('<I', mapped, len(MAGIC))
+        header_end = len(MAGIC) + 4 + header_len
+        header = json.loads(bytes(view[len(MAGIC) + 4:header_end]))
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported cohort store version: {header.get('version')!r}")
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f"'{path}' was written on a {header['byteorder']}-endian machine.")
+
+        store = cls()
+        store.codes, store.letters, store.students = header['codes'], header['letters'], header['students']
+        store._code_ids = {code: i for i, code in enumerate(store.codes)}
+        store._letter_ids = {letter: i for i, letter in enumerate(store.letters)}
+        start = (header_end + 7) & ~7
+        store.columns = {name: view[start + offset:start + offset + nbytes].cast(typecode)
+                         for name, typecode, offset, nbytes in header['columns']}
+        store._mmap, store._view = mapped, view
+        return store
+
+    def close(self):
+        """Releases the memory map of an opened store."""
+        if self._mmap is not None:
+            for column in self.columns.values():
+                column.release()
+            self._view.release()
+            self._mmap.close()
+            self._mmap = self._view = None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query a saved cohort store.")
+    parser.add_argument('path', help="Cohort store written by batch.py --cohort.")
+    parser.add_argument('--course', default=None, help="Only this course code.")
+    parser.add_argument('--semesters', action='store_true', help="Per-semester instead of per-course statistics.")
+    args = parser.parse_args(argv)
+
+    store = CohortStore.open(args.path)
+    try:
+        if args.semesters:
+            stats = store.semester_stats()
+        elif args.course:
+            stats = store.course_stats(args.course)
+        else:
+            stats = store.course_stats()
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+    except KeyError as exc:
+        print(f"Error: Unknown course code {exc}.")
+        return 1
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,229 +1,69 @@
+"""The interactive GPA & progress advisor (rich tables and questionary prompts).
+
+The computation itself lives in gpa_core and is re-exported here. questionary and
+rich are imported only when a prompt or table is actually shown, so importing
+this module, or running the CI path with a plain GPA_REPORT_FORMAT, stays fast.
+"""
+import io
 import json
 import os
-import re
-from collections import defaultdict
-import questionary
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+import sys
+
+from gpa_core import (  # noqa: F401  (re-exported for callers of the original module)
+    AUTO_BRANCH,
+    Attempt,
+    CURRICULUMS_PATH,
+    CURRICULUM_BRANCHES,
+    CURRICULUM_CACHE_VERSION,
+    CourseCodeTable,
+    GENERAL_GRADES,
+    GENERAL_GRADE_CUTOFFS,
+    GRADING_SCHEMES,
+    LEVEL_MAP,
+    PASSING_GRADE_FLOORS,
+    RECORD_FIELDS,
+    SOFTWARE_ENG_GPA_MAP,
+    Semester,
+    StudentProfile,
+    academic_year,
+    build_attempt,
+    calculate_cumulative_gpa,
+    calculate_semester_gpa,
+    compile_curriculums,
+    course_code_table,
+    dashed_course_code,
+    flatten_se_curriculum,
+    get_grade_info,
+    get_grade_info_software_eng,
+    grade_degrees,
+    intake_year,
+    load_branch_curriculum,
+    load_curriculums,
+    load_json_data,
+    normalize_course_code,
+    process_export_file,
+    process_student_data,
+    progress_summary,
+    read_export_student,
+    select_curriculum,
+    sort_semesters,
+)
+from instrumentation import DISABLED, StageProfiler
+from prereq_graph import DEFAULT_CREDIT_HOUR_CAP, PrerequisiteGraph
+
+LOW_BRANCH_CONFIDENCE = 0.5
 
 # --- Utility Functions ---
 def clear_console():
     """Clears the console screen."""
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def get_grade_info(degree):
-    """Converts a numerical degree to a letter grade and GPA points."""
-    try:
-        score = float(degree)
-    except (ValueError, TypeError):
-        return {'letter': 'N/A', 'points': 0.0}
-    if score >= 96: return {'letter': 'A+', 'points': 4.0}
-    if score >= 92: return {'letter': 'A', 'points': 3.7}
-    if score >= 88: return {'letter': 'A-', 'points': 3.4}
-    if score >= 84: return {'letter': 'B+', 'points': 3.2}
-    if score >= 80: return {'letter': 'B', 'points': 3.0}
-    if score >= 76: return {'letter': 'B-', 'points': 2.8}
-    if score >= 72: return {'letter': 'C+', 'points': 2.6}
-    if score >= 68: return {'letter': 'C', 'points': 2.4}
-    if score >= 64: return {'letter': 'C-', 'points': 2.2}
-    if score >= 60: return {'letter': 'D+', 'points': 2.0}
-    if score >= 55: return {'letter': 'D', 'points': 1.5}
-    if score >= 50: return {'letter': 'D-', 'points': 1.0}
-    return {'letter': 'F', 'points': 0.0}
-
-# --- Software Engineering Grading Scheme ---
-SOFTWARE_ENG_GPA_MAP = [
-    (95, 100, 3.7, 4.0, 'A+'),
-    (90, 95, 3.4, 3.7, 'A'),
-    (85, 90, 3.1, 3.4, 'A-'),
-    (80, 85, 2.8, 3.1, 'B+'),
-    (75, 80, 2.5, 2.8, 'B'),
-    (70, 75, 2.2, 2.5, 'C+'),
-    (65, 70, 1.9, 2.2, 'C'),
-    (60, 65, 1.6, 1.9, 'D+'),
-    (50, 60, 1.0, 1.6, 'D'),
-    (0, 50, 0.0, 0.0, 'F'),
-]
-def get_grade_info_software_eng(degree):
-    """Converts a numerical degree to a letter grade and GPA points for Software Engineering branch using the provided mapping."""
-    try:
-        score = float(degree)
-    except (ValueError, TypeError):
-        return {'letter': 'N/A', 'points': 0.0}
-    for lower, upper, gpa_min, gpa_max, letter in SOFTWARE_ENG_GPA_MAP:
-        if lower <= score < upper or (upper == 100 and score == 100):
-            # Linear interpolation within the range
-            if gpa_min == gpa_max:
-                gpa = gpa_min
-            else:
-                gpa = gpa_min + (gpa_max - gpa_min) * (score - lower) / (upper - lower)
-            return {'letter': letter, 'points': round(gpa, 2)}
-    return {'letter': 'F', 'points': 0.0}
-
-# --- Data Loading and Processing ---
-def load_json_data(file_path):
-    """Loads data from a JSON file."""
-    if not os.path.exists(file_path):
-        return None, f"Error: '{file_path}' not found."
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f), None
-    except json.JSONDecodeError:
-        return None, f"Error: Could not decode JSON in '{file_path}'."
-
-def process_student_data(student_response, curriculum, branch=None):
-    """Processes student and curriculum data to build a complete academic profile."""
-    start_year_match = re.search(r'^(\d{2})', student_response.get('StudentCode', ''))
-    start_year = int(f"20{start_year_match.group(1)}") if start_year_match else 2020 # Fallback
-
-    level_map = {"First": 1, "Second": 2, "Third": 3, "Fourth": 4}
-    semesters = {}
-    all_attempts = defaultdict(list)  # Track all attempts for each course code
-    highest_level = 0
-
-    for course in student_response.get('studentProgress', []):
-        code = course.get('crscode', '|').split('|')[0]
-        # Normalize code for Software Engineering branch only
-        if branch == "Software Engineering":
-            code = code.replace('-', '')
-        is_uni_course = code.startswith('UNI-')
-
-        # Use curriculum data for consistency, but handle if UNI course is not in our curriculum file
-        course_info = curriculum.get(code)
-        if not course_info:
-            if is_uni_course:
-                course_info = {
-                    'name': (course.get('crsName', '') + '|').split('|')[1] or (course.get('crsName', '') + '|').split('|')[0],
-                    'credit_hours': float(course.get('creditv') or 0),
-                    'level': 'University Req.',
-                    'prerequisites': []
-                }
-            else:
-                continue
-
-        semester_id = course.get('yearsem')
-        if semester_id not in semesters:
-            semesters[semester_id] = {
-                'courses': [], 'total_points': 0.0, 'total_hours': 0.0, 
-                'year_str': '', 'semester_name': course.get('semesterCourse', '|').split('|')[1]
-            }
-        
-        # --- Determine course status and grade ---
-        is_finished = False
-        degree_display = "In Progress"
-        letter_grade = "-"
-        status = "In Progress"
-        grade_points = 0.0
-
-        if is_uni_course:
-            grade_n = course.get('gradeN')
-            if grade_n is not None and grade_n != '':
-                is_finished = True
-                if 'P' in grade_n.upper():
-                    degree_display, letter_grade, status = "Passed", "P", "Passed"  # Show 'Passed' as degree
-                elif 'BF' in grade_n.upper():
-                    # Show numeric degree if present, else 'BF'
-                    deg_val = course.get('Degree', '')
-                    degree_display = deg_val if deg_val not in (None, '', 'BF', 'bf') else 'BF'
-                    letter_grade = "BF"
-                    status = "Failed"
-                    grade_points = 0.0
-                else:
-                    degree_display, letter_grade, status = "Fail", "F", "Failed"
-        else: # Regular course logic
-            degree_str = course.get('Degree', '')
-            grade_n = course.get('gradeN', '')
-            # If gradeN contains BF, always fail regardless of numeric degree
-            if isinstance(grade_n, str) and 'BF' in grade_n.upper():
-                is_finished = True
-                # Show numeric degree if present, else 'BF'
-                degree_display = degree_str if degree_str not in (None, '', 'BF', 'bf') else 'BF'
-                letter_grade = "BF"
-                status = "Failed"
-                grade_points = 0.0
-            elif isinstance(degree_str, str) and degree_str.strip().upper() == 'BF':
-                is_finished = True
-                degree_display = "BF"
-                letter_grade = "BF"
-                status = "Failed"
-                grade_points = 0.0
-            else:
-                try:
-                    degree_val = float(degree_str)
-                    is_finished = True
-                    # Use the correct grading scheme for GPA calculation
-                    if branch == "Software Engineering":
-                        grade_info = get_grade_info_software_eng(degree_val)
-                    else:
-                        grade_info = get_grade_info(degree_val)
-                    letter_grade = grade_info['letter']
-                    grade_points = grade_info['points']
-                    degree_display = degree_str
-                    status = "Passed" if grade_points > 0 else "Failed"
-                except (ValueError, TypeError):
-                    pass # Stays as "In Progress"
-
-        # Store all attempts for retake logic
-        all_attempts[code].append({
-            'semester_id': semester_id,
-            'name': course_info['name'],
-            'code': code,
-            'degree': degree_display,
-            'letter': letter_grade,
-            'hours': course_info['credit_hours'],
-            'status': status,
-            'is_finished': is_finished,
-            'grade_points': grade_points,
-            'is_uni_course': is_uni_course,
-            'course_info': course_info
-        })
-
-        # Determine academic year string
-        level_str = course_info.get('level', 'Unknown').split(' ')[0]
-        level_ord = level_map.get(level_str, 0)
-        if level_ord > 0:
-            highest_level = max(highest_level, level_ord)
-            year = start_year + level_ord - 1
-            semesters[semester_id]['year_str'] = f"{year}/{year + 1}"
-        
-    # Now, for each course code, decide which attempts to count for GPA/progress
-    passed_courses = set()
-    for code, attempts in all_attempts.items():
-        # Sort attempts by semester (assuming semester_id is sortable)
-        attempts_sorted = sorted(attempts, key=lambda x: x['semester_id'])
-        # Add all attempts to their respective semesters for display
-        for att in attempts_sorted:
-            if not att['is_uni_course'] and not att['is_finished'] and att['status'] == 'In Progress':
-                # Only show registered/in-progress if not finished
-                course_obj = att.copy()
-                semesters[att['semester_id']]['courses'].append(course_obj)
-            elif att['is_finished'] or att['status'] != 'In Progress':
-                semesters[att['semester_id']]['courses'].append(att.copy())
-        # Only the latest passing attempt counts for progress and GPA
-        latest_pass = None
-        for att in reversed(attempts_sorted):
-            if att['is_finished'] and att['status'] == 'Passed':
-                latest_pass = att
-                break
-        if latest_pass:
-            passed_courses.add(code)
-        # For GPA, only count the latest finished attempt (even if failed), and skip UNI courses
-        latest_finished = None
-        for att in reversed(attempts_sorted):
-            if att['is_finished'] and not att['is_uni_course']:
-                latest_finished = att
-                break
-        if latest_finished and not latest_finished['is_uni_course']:
-            sem = semesters[latest_finished['semester_id']]
-            sem['total_points'] += latest_finished['grade_points'] * latest_finished['hours']
-            sem['total_hours'] += latest_finished['hours']
-
-    return semesters, passed_courses, highest_level, None
-
 # --- Display Functions ---
 def display_semester(console, semester_data, semester_name):
     """Displays a formatted table for a single semester."""
+    from rich.panel import Panel
+    from rich.table import Table
+
     table = Table(title=f"📚 {semester_name}", title_style="bold green", show_header=True, header_style="bold magenta")
     table.add_column("Course Name", style="cyan", no_wrap=True, width=40)
     table.add_column("Code", style="white")
@@ -232,19 +72,19 @@ def display_semester(console, semester_data, semester_name):
     table.add_column("Letter Grade", justify="right", style="blue")
     table.add_column("Status", style="white")
     
-    for c in sorted(semester_data['courses'], key=lambda x: x['code']):
-        grade_color = "red" if c['letter'] == 'F' else "blue"
-        status_color = "green" if c['status'] == "Passed" else "yellow"
+    for c in sorted(semester_data.courses, key=lambda x: x.code):
+        grade_color = "red" if c.letter == 'F' else "blue"
+        status_color = "green" if c.status == "Passed" else "yellow"
         table.add_row(
-            c['name'], c['code'], f"{c['hours']:.1f}", str(c['degree']),
-            f"[{grade_color}]{c['letter']}[/{grade_color}]",
-            f"[{status_color}]{c['status']}[/{status_color}]"
+            c.name, c.code, f"{c.hours:.1f}", str(c.degree),
+            f"[{grade_color}]{c.letter}[/{grade_color}]",
+            f"[{status_color}]{c.status}[/{status_color}]"
         )
     
     console.print(table)
     
     # Display Semester GPA in a formatted table
-    gpa = (semester_data['total_points'] / semester_data['total_hours']) if semester_data['total_hours'] > 0 else 0
+    gpa = calculate_semester_gpa(semester_data)
     gpa_table = Table(show_header=False, show_edge=False, box=None, padding=(0, 1))
     gpa_table.add_column(style="bold")
     gpa_table.add_column(style="bold cyan", justify="right")
@@ -258,46 +98,92 @@ def display_all_semesters(console, semesters):
         console.print("[bold red]No semester data to display.[/bold red]")
         return
         
-    sorted_semesters = sorted(semesters.items(), key=lambda x: x[0] if x[0] is not None else 0)
-    for sem_id, sem_data in sorted_semesters:
-        display_semester(console, sem_data, f"{sem_data['year_str']} - {sem_data['semester_name']}")
+    for sem_id, sem_data in sort_semesters(semesters):
+        display_semester(console, sem_data, f"{sem_data.year_str} - {sem_data.semester_name}")
 
 def display_cumulative_gpa(console, semesters):
     """Calculates and displays the cumulative GPA."""
-    total_points = sum(s['total_points'] for s in semesters.values())
-    total_hours = sum(s['total_hours'] for s in semesters.values())
-    gpa = (total_points / total_hours) if total_hours > 0 else 0
+    from rich.panel import Panel
+
+    gpa, _ = calculate_cumulative_gpa(semesters)
     
     console.print(Panel(f"[bold cyan]🏆 Cumulative GPA: {gpa:.2f}[/bold cyan]", title="Overall Result", border_style="bold blue"))
 
-def display_progress_report(console, curriculum, passed_courses):
+def display_progress_report(console, curriculum, passed_courses, graph=None):
+    """Displays credit-hour progress and the remaining courses with their prerequisite status.
+
+    Pass a PrerequisiteGraph built once for the curriculum to avoid rebuilding it per call.
+    """
+    display_progress_tables(console, progress_summary(curriculum, passed_courses, graph))
+
+def display_progress_tables(console, progress):
+    """Displays a progress_summary result as rich tables."""
+    from rich.panel import Panel
+    from rich.table import Table
+
     console.print(Panel("[bold cyan]Degree Progress Report[/bold cyan]", border_style="blue"))
     
-    total_hours = sum(c['credit_hours'] for c in curriculum.values())
-    completed_hours = sum(curriculum[c]['credit_hours'] for c in passed_courses if c in curriculum)
+    total_hours, completed_hours = progress['total_hours'], progress['completed_hours']
     
     if total_hours == 0:
         console.print("[bold red]No curriculum credit hours found. Please check your curriculum data.[/bold red]")
         return
     console.print(f"[bold]Credit Hours:[/bold] {completed_hours} / {total_hours} ({completed_hours/total_hours:.1%}) Completed\n")
     
-    remaining_courses = {code: data for code, data in curriculum.items() if code not in passed_courses}
-    
     table = Table(title="Remaining Courses", title_style="bold yellow")
     table.add_column("Code", style="white")
     table.add_column("Course Name", style="cyan", width=40)
     table.add_column("Hours", style="yellow")
     table.add_column("Prerequisites Met?", style="white")
+    table.add_column("Blocked By", style="dim")
 
-    for code, data in sorted(remaining_courses.items(), key=lambda item: (item[1]['level'], item[1]['semester'])):
-        prereqs_met = all(p in passed_courses for p in data['prerequisites'])
-        status_str = "[green]Yes[/green]" if prereqs_met else "[red]No[/red]"
-        table.add_row(code, data['name'], str(data['credit_hours']), status_str)
+    for row in progress['remaining']:
+        status_str = "[green]Yes[/green]" if row['eligible'] else "[red]No[/red]"
+        table.add_row(row['code'], row['name'], str(row['hours']), status_str, ", ".join(row['blocked_by']))
     
     console.print(table)
+    if progress['remaining']:
+        console.print(f"[bold]Estimated semesters to graduate[/bold] (up to {DEFAULT_CREDIT_HOUR_CAP} credit hours each): {progress['estimated_semesters']}")
+
+def _is_gpa(value):
+    try:
+        return 0 <= float(value) <= 4
+    except ValueError:
+        return False
+
+def display_target_plan(console, plan):
+    """Displays the result of target_solver.solve_target_gpa."""
+    from rich.panel import Panel
+    from rich.table import Table
+
+    console.print(Panel(f"[bold cyan]🎯 Target Cumulative GPA: {plan['target']:.2f}[/bold cyan]", border_style="blue"))
+    console.print(f"[bold]Current GPA:[/bold] {plan['current_gpa']:.2f} over {plan['current_hours']:g} hours; "
+                  f"{plan['remaining_hours']:g} hours remaining\n")
+    if not plan['feasible']:
+        console.print(f"[bold red]This target is out of reach. The highest achievable GPA is {plan['max_gpa']:.2f}.[/bold red]")
+        return
+    if not plan['plan']:
+        console.print("[green]No courses remain and the target is already met.[/green]")
+        return
+    if plan['uniform_degree'] is not None:
+        console.print(f"[bold]Simplest route:[/bold] score at least [bold green]{plan['uniform_degree']}[/bold green] in every remaining course.\n")
+
+    table = Table(title="Lowest Grades That Reach the Target", title_style="bold yellow")
+    table.add_column("Code", style="white")
+    table.add_column("Course Name", style="cyan", width=40)
+    table.add_column("Hours", style="yellow")
+    table.add_column("Letter Grade", justify="right", style="blue")
+    table.add_column("Minimum Degree", justify="right", style="green")
+    for item in plan['plan']:
+        table.add_row(item['code'], item['name'], str(item['hours']), item['letter'], str(item['min_degree']))
+    console.print(table)
+    console.print(f"[bold]Projected Cumulative GPA:[/bold] {plan['projected_gpa']:.2f}")
 
-def get_pasted_data(console):
+def get_pasted_data(console, profiler=DISABLED):
     """Prompts the user to paste JSON data and parses it."""
+    import questionary
+    from rich.panel import Panel
+
     console.print(
         Panel(
             "[bold yellow]Please paste the JSON content from the student portal below.[/bold yellow]\n\n"
@@ -317,50 +203,47 @@ def get_pasted_data(console):
         return None, "No data was pasted."
 
     try:
-        data = json.loads(json_input)
+        with profiler.stage('parse'):
+            data = json.loads(json_input)
         return data, None
     except json.JSONDecodeError:
         return None, "Error: Invalid JSON format. Please make sure you copied the entire content correctly."
 
-def load_curriculums():
-    """Loads all curricula from curriculums.json."""
-    with open('curriculums.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def flatten_se_curriculum(json_data):
-    """Flattens the nested Software Engineering curriculum JSON into a flat dict like the General curriculum, including both dashed and non-dashed codes as keys."""
-    flat = {}
-    for level, semesters in json_data.items():
-        if not isinstance(semesters, dict):
-            continue
-        for semester, courses in semesters.items():
-            if not isinstance(courses, list):
-                continue
-            for course in courses:
-                code = course['code']
-                flat[code] = {
-                    'name': course['name'],
-                    'credit_hours': course.get('credit_hours', 3),
-                    'prerequisites': course.get('prerequisites', []),
-                    'level': course['level'],
-                    'semester': course['semester'],
-                    'track': course.get('type', 'General'),
-                    'type': course.get('type', 'General')
-                }
-                # Also add a version with dashes if not present
-                if '-' not in code:
-                    dashed_code = code[:3] + '-' + code[3:] if len(code) > 3 else code
-                    flat[dashed_code] = flat[code]
-                else:
-                    nodash_code = code.replace('-', '')
-                    flat[nodash_code] = flat[code]
-    return flat
+def detect_student_branch(console, student_response, profiler=DISABLED):
+    """Detects the student's branch from their records and loads its curriculum.
+
+    Returns (branch, curriculum, prerequisite graph).
+    """
+    from branch_detect import branch_index
+    with profiler.stage('load_curriculum'):
+        index = branch_index()
+    with profiler.stage('detect_branch'):
+        detection = index.detect(student_response)
+    branch = detection['branch']
+    if detection['confidence'] < LOW_BRANCH_CONFIDENCE:
+        console.print(f"[yellow]Could not reliably tell your branch from your courses; "
+                      f"using {branch}.[/yellow]")
+    else:
+        console.print(f"[green]Detected branch: {branch} "
+                      f"({detection['confidence']:.0%} confidence).[/green]")
+    with profiler.stage('build_graph'):
+        graph = PrerequisiteGraph(index.curricula[branch])
+    return branch, index.curricula[branch], graph
 
 # --- Main Application ---
 def main():
-    console = Console()
-    curriculums = load_curriculums()
-    
+    # GPA_PROFILE=1 or --profile times each stage; see instrumentation.py
+    profiler = StageProfiler.from_env()
+    try:
+        from rich.console import Console
+        run(Console(), profiler)
+    finally:
+        profiler.report()
+
+def select_branch():
+    """Prompts for the faculty and branch; returns a branch, AUTO_BRANCH, or None if cancelled."""
+    import questionary
+
     # Faculty selection
     faculty_choice = questionary.select(
         "Select your faculty:",
@@ -375,53 +258,105 @@ def main():
         branch_choice = questionary.select(
             "Select your branch:",
             choices=[
+                questionary.Choice("Detect from my data", value=AUTO_BRANCH),
                 "General",
                 "Software Engineering",
                 questionary.Choice("Artificial Intelligence (Coming Soon!)", disabled="Not available yet")
             ]
         ).ask()
-        
-        if branch_choice == "General":
-            curriculum = curriculums["General"]
-            grade_info_func = get_grade_info
-        elif branch_choice == "Software Engineering":
-            curriculum = flatten_se_curriculum(curriculums["SoftwareEngineering"]["curriculum"])
-            grade_info_func = get_grade_info_software_eng
     else:
-        curriculum = curriculums["General"]
-        grade_info_func = get_grade_info
+        branch_choice = "General"
+    return branch_choice
 
+def run(console, profiler=DISABLED):
+    """The advisor itself: branch selection, then CI report or the interactive menu."""
     # Check if running in a non-interactive CI environment
     is_ci = os.getenv('CI') == 'true' or os.getenv('GITHUB_ACTIONS') == 'true'
 
+    if is_ci:
+        # GPA_REPORT_FORMAT=text|csv|json|html swaps the rich tables for a plain renderer
+        from renderers import RENDERERS
+        report_format = os.getenv('GPA_REPORT_FORMAT', 'rich')
+        if report_format != 'rich':
+            # Keep stdout to the report alone, so it can be piped into another tool
+            from rich.console import Console
+            console = Console(stderr=True)
+        if report_format not in RENDERERS:
+            console.print(f"[bold red]Error: Unknown GPA_REPORT_FORMAT {report_format!r}. "
+                          f"Expected one of: {', '.join(sorted(RENDERERS))}.[/bold red]")
+            return
+        # Nobody can answer prompts here: GPA_BRANCH names the branch, or it is detected from the export
+        branch_choice = os.getenv('GPA_BRANCH', AUTO_BRANCH)
+        if branch_choice not in CURRICULUM_BRANCHES + (AUTO_BRANCH,):
+            console.print(f"[bold red]Error: Unknown GPA_BRANCH {branch_choice!r}.[/bold red]")
+            return
+    else:
+        branch_choice = select_branch()
+        if branch_choice is None:
+            return
+
+    # With auto-detection the curriculum is only known once the student's records are read
+    curriculum = graph = None
+    if branch_choice != AUTO_BRANCH:
+        with profiler.stage('load_curriculum'):
+            curriculum = load_branch_curriculum(branch_choice)
+        with profiler.stage('build_graph'):
+            graph = PrerequisiteGraph(curriculum)
+
     if is_ci:
         # Non-interactive mode for GitHub Actions
         console.print("[dim]CI environment detected. Running in non-interactive mode...[/dim]")
-        student_response, error = load_json_data('Response.txt')
+        if branch_choice == AUTO_BRANCH:
+            student_response, error = read_export_student('Response.txt', profiler)
+            if not error:
+                branch_choice, curriculum, graph = detect_student_branch(console, student_response, profiler)
+                with profiler.stage('process'):
+                    semesters, passed, level, error = process_student_data(student_response, curriculum,
+                                                                           branch_choice)
+        else:
+            semesters, passed, level, error = process_export_file('Response.txt', curriculum, branch_choice,
+                                                                  profiler)
         if error:
             console.print(f"[bold red]{error}[/bold red]"); return
 
-        semesters, passed, level, error = process_student_data(student_response, curriculum, branch_choice)
-        if error:
-            console.print(f"[bold red]{error}[/bold red]"); return
-            
+        if report_format != 'rich':
+            from renderers import render_report
+            with profiler.stage(f'render_{report_format}'):
+                buffer = io.StringIO()
+                render_report(report_format, buffer, semesters,
+                              progress_summary(curriculum, passed, graph), "Full Academic Report")
+                sys.stdout.write(buffer.getvalue())
+            return
+
         # Print all reports
+        from rich.panel import Panel
         console.print(Panel("[bold cyan]Full Academic Report[/bold cyan]", border_style="green", expand=False))
-        display_all_semesters(console, semesters)
-        display_cumulative_gpa(console, semesters)
-        display_progress_report(console, curriculum, passed)
+        with profiler.stage('display_all_semesters'):
+            display_all_semesters(console, semesters)
+        with profiler.stage('display_cumulative_gpa'):
+            display_cumulative_gpa(console, semesters)
+        with profiler.stage('display_progress_report'):
+            display_progress_report(console, curriculum, passed, graph)
         console.print("\n[green]✅ Report generation complete.[/green]")
 
     else:
         # Interactive mode for local execution
-        student_response, error = get_pasted_data(console)
+        import questionary
+        from rich.panel import Panel
+
+        student_response, error = get_pasted_data(console, profiler)
         if error:
             console.print(f"[bold red]{error}[/bold red]")
             return
+        if branch_choice == AUTO_BRANCH:
+            branch_choice, curriculum, graph = detect_student_branch(console, student_response, profiler)
+            questionary.press_any_key_to_continue().ask()
 
-        semesters, passed, level, error = process_student_data(student_response, curriculum, branch_choice)
-        if error:
-            console.print(f"[bold red]{error}[/bold red]"); return
+        # Kept across "Paste New Data" so a new export only recomputes what changed
+        profile = StudentProfile(curriculum, branch_choice)
+        with profiler.stage('process'):
+            profile.update(student_response)
+        semesters, passed = profile.semesters, profile.passed_courses
 
         while True:
             clear_console()
@@ -434,23 +369,26 @@ def main():
                     "View Report for a Specific Semester",
                     "View Full GPA Report (All Semesters)",
                     "Show Cumulative GPA Only",
+                    "Plan for a Target GPA",
                     "Paste New Data",
                     "Exit"
                 ]
             ).ask()
 
             if choice == "View My Degree Progress":
-                display_progress_report(console, curriculum, passed)
+                with profiler.stage('display_progress_report'):
+                    display_progress_report(console, curriculum, passed, graph)
             elif choice == "View Full GPA Report (All Semesters)":
                 if semesters:
-                    display_all_semesters(console, semesters)
+                    with profiler.stage('display_all_semesters'):
+                        display_all_semesters(console, semesters)
             
             elif choice == "View Report for a Specific Semester":
                 if not semesters:
                     console.print("[yellow]No semesters available to select.[/yellow]")
                     continue
                 
-                semester_choices = {f"{s['year_str']} - {s['semester_name']}": sid for sid, s in semesters.items() if sid is not None}
+                semester_choices = {f"{s.year_str} - {s.semester_name}": sid for sid, s in semesters.items() if sid is not None}
                 if not semester_choices:
                     console.print("[yellow]No semesters available to select.[/yellow]")
                     continue
@@ -462,24 +400,36 @@ def main():
                 
                 if selected_semester_name:
                     selected_id = semester_choices[selected_semester_name]
-                    display_semester(console, semesters[selected_id], selected_semester_name)
+                    with profiler.stage('display_semester'):
+                        display_semester(console, semesters[selected_id], selected_semester_name)
 
             elif choice == "Show Cumulative GPA Only":
                 if semesters:
-                    display_cumulative_gpa(console, semesters)
+                    with profiler.stage('display_cumulative_gpa'):
+                        display_cumulative_gpa(console, semesters)
+
+            elif choice == "Plan for a Target GPA":
+                from target_solver import solve_target_gpa
+                target_str = questionary.text(
+                    "Target cumulative GPA (0.00 - 4.00):",
+                    validate=lambda v: _is_gpa(v) or "Please enter a number between 0 and 4."
+                ).ask()
+                if target_str:
+                    with profiler.stage('solve_target_gpa'):
+                        plan = solve_target_gpa(semesters, curriculum, passed, float(target_str),
+                                                branch_choice, graph)
+                    with profiler.stage('display_target_plan'):
+                        display_target_plan(console, plan)
             
             elif choice == "Paste New Data":
-                student_response, error = get_pasted_data(console)
+                student_response, error = get_pasted_data(console, profiler)
                 if error:
                     console.print(f"[bold red]{error}[/bold red]")
                     console.print("[bold yellow]Continuing with previous data.[/bold yellow]")
                 else:
-                    semesters, passed, level, error = process_student_data(student_response, curriculum, branch_choice)
-                    if error:
-                        console.print(f"[bold red]{error}[/bold red]")
-                        console.print("[bold yellow]Could not process new data, reverting to previous data.[/bold yellow]")
-                    else:
-                        console.print(f"[green]Successfully loaded new pasted data.[/green]")
+                    with profiler.stage('process'):
+                        changed = profile.update(student_response)
+                    console.print(f"[green]Successfully loaded new pasted data ({len(changed)} semester(s) updated).[/green]")
 
             elif choice == "Exit" or choice is None:
                 break
@@ -0,0 +1,706 @@
+"""The GPA computation core: grading schemes, record processing and curriculum loading.
+
+Nothing here imports a UI library, so batch runs, the server and other headless
+callers can import it without paying for questionary and rich. gpa_calculator
+re-exports all of it alongside the interactive advisor.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+from bisect import bisect_right
+from contextlib import closing
+
+from instrumentation import DISABLED
+from portal_stream import PortalStreamError, stream_student_file
+from prereq_graph import DEFAULT_CREDIT_HOUR_CAP, PrerequisiteGraph
+
+# --- Grading Schemes ---
+# Breakpoint tables shared by the scalar and batch grading functions.
+GENERAL_GRADE_CUTOFFS = (50, 55, 60, 64, 68, 72, 76, 80, 84, 88, 92, 96)
+GENERAL_GRADES = (
+    ('F', 0.0), ('D-', 1.0), ('D', 1.5), ('D+', 2.0), ('C-', 2.2), ('C', 2.4), ('C+', 2.6),
+    ('B-', 2.8), ('B', 3.0), ('B+', 3.2), ('A-', 3.4), ('A', 3.7), ('A+', 4.0),
+)
+
+def _grade_general(score):
+    """Returns (letter, points) for a float score under the General scheme."""
+    if score != score:  # NaN fails every comparison, which the if-chain treated as F
+        return GENERAL_GRADES[0]
+    return GENERAL_GRADES[bisect_right(GENERAL_GRADE_CUTOFFS, score)]
+
+def get_grade_info(degree):
+    """Converts a numerical degree to a letter grade and GPA points."""
+    try:
+        score = float(degree)
+    except (ValueError, TypeError):
+        return {'letter': 'N/A', 'points': 0.0}
+    letter, points = _grade_general(score)
+    return {'letter': letter, 'points': points}
+
+# --- Software Engineering Grading Scheme ---
+SOFTWARE_ENG_GPA_MAP = [
+    (95, 100, 3.7, 4.0, 'A+'),
+    (90, 95, 3.4, 3.7, 'A'),
+    (85, 90, 3.1, 3.4, 'A-'),
+    (80, 85, 2.8, 3.1, 'B+'),
+    (75, 80, 2.5, 2.8, 'B'),
+    (70, 75, 2.2, 2.5, 'C+'),
+    (65, 70, 1.9, 2.2, 'C'),
+    (60, 65, 1.6, 1.9, 'D+'),
+    (50, 60, 1.0, 1.6, 'D'),
+    (0, 50, 0.0, 0.0, 'F'),
+]
+_SE_BANDS = tuple(reversed(SOFTWARE_ENG_GPA_MAP))
+_SE_LOWERS = tuple(band[0] for band in _SE_BANDS)
+
+def _grade_software_eng(score):
+    """Returns (letter, points) for a float score under the Software Engineering scheme."""
+    if not 0 <= score <= 100:  # also rejects NaN
+        return ('F', 0.0)
+    if score == 100:
+        lower, upper, gpa_min, gpa_max, letter = _SE_BANDS[-1]
+    else:
+        lower, upper, gpa_min, gpa_max, letter = _SE_BANDS[bisect_right(_SE_LOWERS, score) - 1]
+    # Linear interpolation within the range
+    if gpa_min == gpa_max:
+        gpa = gpa_min
+    else:
+        gpa = gpa_min + (gpa_max - gpa_min) * (score - lower) / (upper - lower)
+    return (letter, round(gpa, 2))
+
+def get_grade_info_software_eng(degree):
+    """Converts a numerical degree to a letter grade and GPA points for Software Engineering branch using the provided mapping."""
+    try:
+        score = float(degree)
+    except (ValueError, TypeError):
+        return {'letter': 'N/A', 'points': 0.0}
+    letter, points = _grade_software_eng(score)
+    return {'letter': letter, 'points': points}
+
+GRADING_SCHEMES = {
+    "General": _grade_general,
+    "Software Engineering": _grade_software_eng,
+}
+# Lowest degree of each passing letter grade, per scheme
+PASSING_GRADE_FLOORS = {
+    "General": GENERAL_GRADE_CUTOFFS,
+    "Software Engineering": tuple(lower for lower in _SE_LOWERS if lower > 0),
+}
+
+def grade_degrees(degrees, scheme="General"):
+    """Grades a sequence of degrees at once, returning parallel lists of letters and points.
+
+    Results are identical to calling get_grade_info / get_grade_info_software_eng per degree;
+    values that are not numeric get 'N/A' and 0.0.
+    """
+    try:
+        grade = GRADING_SCHEMES[scheme]
+    except KeyError:
+        raise ValueError(f"Unknown grading scheme: {scheme!r}") from None
+    letters, points = [], []
+    add_letter, add_points = letters.append, points.append
+    for degree in degrees:
+        try:
+            score = float(degree)
+        except (ValueError, TypeError):
+            add_letter('N/A'); add_points(0.0)
+            continue
+        letter, pts = grade(score)
+        add_letter(letter); add_points(pts)
+    return letters, points
+
+# --- Data Loading and Processing ---
+def load_json_data(file_path):
+    """Loads data from a JSON file."""
+    if not os.path.exists(file_path):
+        return None, f"Error: '{file_path}' not found."
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f), None
+    except json.JSONDecodeError:
+        return None, f"Error: Could not decode JSON in '{file_path}'."
+
+def process_export_file(file_path, curriculum, branch=None, profiler=DISABLED):
+    """Streams the first student in an export file straight into process_student_data.
+
+    With an enabled profiler the records are read eagerly, so that parsing and
+    processing show up as separate stages.
+    """
+    if not os.path.exists(file_path):
+        return None, None, 0, f"Error: '{file_path}' not found."
+    try:
+        # Keep the stream open until its records are consumed; closing it closes the file
+        with closing(stream_student_file(file_path)) as students:
+            with profiler.stage('parse'):
+                student_response = next(students, None)
+                if profiler.enabled and student_response and 'studentProgress' in student_response:
+                    student_response['studentProgress'] = list(student_response['studentProgress'])
+            if student_response is None:
+                return None, None, 0, f"Error: No student data found in '{file_path}'."
+            with profiler.stage('process'):
+                return process_student_data(student_response, curriculum, branch)
+    except PortalStreamError:
+        return None, None, 0, f"Error: Could not decode JSON in '{file_path}'."
+
+LEVEL_MAP = {"First": 1, "Second": 2, "Third": 3, "Fourth": 4}
+
+class Attempt:
+    """One attempt at a course, as listed in its semester's table."""
+    __slots__ = ('semester_id', 'name', 'code', 'degree', 'letter', 'hours', 'status',
+                 'is_finished', 'grade_points', 'is_uni_course', 'course_info')
+
+    def __init__(self, semester_id, code, course_info, degree, letter, status,
+                 is_finished, grade_points, is_uni_course):
+        self.semester_id = semester_id
+        self.name = course_info['name']
+        self.code = code
+        self.degree = degree
+        self.letter = letter
+        self.hours = course_info['credit_hours']
+        self.status = status
+        self.is_finished = is_finished
+        self.grade_points = grade_points
+        self.is_uni_course = is_uni_course
+        self.course_info = course_info
+
+class Semester:
+    """The attempts taken in one semester and the GPA totals they contribute."""
+    __slots__ = ('courses', 'total_points', 'total_hours', 'year_str', 'semester_name')
+
+    def __init__(self, semester_name):
+        self.courses = []
+        self.total_points = 0.0
+        self.total_hours = 0.0
+        self.year_str = ''
+        self.semester_name = semester_name
+
+def _course_level(course_info):
+    """Returns the level ordinal (1-4) of a curriculum entry, or 0 if it has none."""
+    return LEVEL_MAP.get(course_info.get('level', 'Unknown').split(' ')[0], 0)
+
+def normalize_course_code(crscode, branch=None):
+    """Extracts the curriculum key from a portal 'crscode' value ('CODE|...')."""
+    code = crscode.split('|')[0]
+    # Normalize code for Software Engineering branch only
+    if branch == "Software Engineering":
+        code = code.replace('-', '')
+    return code
+
+def dashed_course_code(code):
+    """The portal's dashed spelling of an undashed code ('CSC101' -> 'CSC-101')."""
+    return code[:3] + '-' + code[3:] if len(code) > 3 else code
+
+class CourseCodeTable:
+    """Maps every known spelling of a curriculum course code to one integer id.
+
+    Built once per curriculum, so resolving a portal 'crscode' is a single dict hit
+    on its code part instead of normalizing the string and probing the curriculum.
+    For Software Engineering both the dashed and undashed spellings are registered
+    and the undashed one is canonical, matching normalize_course_code.
+    """
+
+    def __init__(self, curriculum, branch=None):
+        self.branch = branch
+        self.codes = []      # id -> canonical code
+        self.entries = []    # id -> curriculum entry
+        self.ids = {}        # spelling -> id
+        self.spellings = {}  # spelling -> (canonical code, entry)
+        for code, data in curriculum.items():
+            canonical = normalize_course_code(code, branch)
+            course_id = self.ids.get(canonical)
+            if course_id is None:
+                course_id = len(self.codes)
+                self.codes.append(canonical)
+                self.entries.append(data)
+            names = {code, canonical}
+            if branch == "Software Engineering":
+                names.add(dashed_course_code(canonical))
+            for name in names:
+                if name not in self.ids:
+                    self.ids[name] = course_id
+                    self.spellings[name] = (canonical, self.entries[course_id])
+
+    def resolve(self, crscode):
+        """Returns (canonical code, curriculum entry or None) for a raw portal crscode."""
+        known = self.spellings.get(crscode.partition('|')[0])
+        if known is not None:
+            return known
+        code = normalize_course_code(crscode, self.branch)
+        return self.spellings.get(code) or (code, None)
+
+CODE_TABLE_CACHE_SIZE = 8
+_code_tables = {}  # (id(curriculum), branch) -> (curriculum, table), least recently used first
+
+def course_code_table(curriculum, branch=None):
+    """Returns the CourseCodeTable for a curriculum, building it on first use.
+
+    Curricula are loaded once and never modified, so tables are kept per curriculum
+    object. Only the CODE_TABLE_CACHE_SIZE most recently used are kept, so callers
+    that build a fresh curriculum per call do not pin every one of them in memory.
+    """
+    key = (id(curriculum), branch)
+    cached = _code_tables.pop(key, None)
+    if cached is None or cached[0] is not curriculum:
+        cached = (curriculum, CourseCodeTable(curriculum, branch))
+    _code_tables[key] = cached
+    if len(_code_tables) > CODE_TABLE_CACHE_SIZE:
+        del _code_tables[next(iter(_code_tables))]
+    return cached[1]
+
+def build_attempt(course, curriculum, branch=None, codes=None):
+    """Builds the Attempt for one studentProgress record, or None if the course is unknown.
+
+    `codes` is the curriculum's CourseCodeTable; it is looked up when not given.
+    """
+    code, course_info = (codes or course_code_table(curriculum, branch)).resolve(course.get('crscode', '|'))
+    is_uni_course = code.startswith('UNI-')
+
+    # Use curriculum data for consistency, but handle if UNI course is not in our curriculum file
+    if not course_info:
+        if is_uni_course:
+            course_info = {
+                'name': (course.get('crsName', '') + '|').split('|')[1] or (course.get('crsName', '') + '|').split('|')[0],
+                'credit_hours': float(course.get('creditv') or 0),
+                'level': 'University Req.',
+                'prerequisites': []
+            }
+        else:
+            return None
+
+    # --- Determine course status and grade ---
+    is_finished = False
+    degree_display = "In Progress"
+    letter_grade = "-"
+    status = "In Progress"
+    grade_points = 0.0
+
+    if is_uni_course:
+        grade_n = course.get('gradeN')
+        if grade_n is not None and grade_n != '':
+            is_finished = True
+            if 'P' in grade_n.upper():
+                degree_display, letter_grade, status = "Passed", "P", "Passed"  # Show 'Passed' as degree
+            elif 'BF' in grade_n.upper():
+                # Show numeric degree if present, else 'BF'
+                deg_val = course.get('Degree', '')
+                degree_display = deg_val if deg_val not in (None, '', 'BF', 'bf') else 'BF'
+                letter_grade = "BF"
+                status = "Failed"
+            else:
+                degree_display, letter_grade, status = "Fail", "F", "Failed"
+    else: # Regular course logic
+        degree_str = course.get('Degree', '')
+        grade_n = course.get('gradeN', '')
+        # If gradeN contains BF, always fail regardless of numeric degree
+        if isinstance(grade_n, str) and 'BF' in grade_n.upper():
+            is_finished = True
+            # Show numeric degree if present, else 'BF'
+            degree_display = degree_str if degree_str not in (None, '', 'BF', 'bf') else 'BF'
+            letter_grade = "BF"
+            status = "Failed"
+        elif isinstance(degree_str, str) and degree_str.strip().upper() == 'BF':
+            is_finished = True
+            degree_display = "BF"
+            letter_grade = "BF"
+            status = "Failed"
+        else:
+            try:
+                degree_val = float(degree_str)
+                is_finished = True
+                # Use the correct grading scheme for GPA calculation
+                if branch == "Software Engineering":
+                    letter_grade, grade_points = _grade_software_eng(degree_val)
+                else:
+                    letter_grade, grade_points = _grade_general(degree_val)
+                degree_display = degree_str
+                status = "Passed" if grade_points > 0 else "Failed"
+            except (ValueError, TypeError):
+                pass # Stays as "In Progress"
+
+    return Attempt(course.get('yearsem'), code, course_info, degree_display, letter_grade,
+                   status, is_finished, grade_points, is_uni_course)
+
+def intake_year(student_code):
+    """Returns the intake year encoded in a StudentCode's first two digits, or None."""
+    start_year_match = re.search(r'^(\d{2})', student_code or '')
+    return int(f"20{start_year_match.group(1)}") if start_year_match else None
+
+def academic_year(student_code, level_ord):
+    """Returns the 'YYYY/YYYY' academic year a student spent at the given level."""
+    start_year = intake_year(student_code) or 2020 # Fallback
+    year = start_year + level_ord - 1
+    return f"{year}/{year + 1}"
+
+def process_student_data(student_response, curriculum, branch=None):
+    """Processes student and curriculum data to build a complete academic profile.
+
+    'studentProgress' is iterated exactly once and may be a lazy iterator (see
+    portal_stream); the other response keys are read only after it is consumed.
+    Retakes are resolved in the same pass: per course code we keep the latest
+    passing attempt (for progress) and the latest finished non-UNI attempt (for GPA).
+    """
+    semesters = {}
+    semester_levels = {}  # Level of the last leveled course seen in each semester
+    latest_finished = {}  # code -> latest finished non-UNI attempt (None if none yet)
+    passed_courses = set()
+    highest_level = 0
+    codes = course_code_table(curriculum, branch)
+
+    for course in student_response.get('studentProgress', []):
+        att = build_attempt(course, curriculum, branch, codes)
+        if att is None:
+            continue
+
+        semester_id = att.semester_id
+        sem = semesters.get(semester_id)
+        if sem is None:
+            sem = semesters[semester_id] = Semester(course.get('semesterCourse', '|').split('|')[1])
+        # Unfinished UNI registrations are not listed in the semester table
+        if att.is_finished or not att.is_uni_course:
+            sem.courses.append(att)
+
+        code = att.code
+        current = latest_finished.get(code)
+        if att.is_finished and att.status == 'Passed':
+            passed_courses.add(code)
+        if att.is_finished and not att.is_uni_course:
+            # '>=' keeps the later record when two attempts share a semester
+            if current is None or semester_id >= current.semester_id:
+                latest_finished[code] = att
+        elif current is None:
+            # Reserve the slot so totals are summed in first-seen course order
+            latest_finished[code] = None
+
+        # Determine academic year string
+        level_ord = _course_level(att.course_info)
+        if level_ord > 0:
+            highest_level = max(highest_level, level_ord)
+            semester_levels[semester_id] = level_ord
+
+    student_code = student_response.get('StudentCode', '')
+    for semester_id, level_ord in semester_levels.items():
+        semesters[semester_id].year_str = academic_year(student_code, level_ord)
+
+    # For GPA, only the latest finished attempt of each course counts (even if failed)
+    for att in latest_finished.values():
+        if att is None:
+            continue
+        sem = semesters[att.semester_id]
+        sem.total_points += att.grade_points * att.hours
+        sem.total_hours += att.hours
+
+    return semesters, passed_courses, highest_level, None
+
+# Portal fields that determine an attempt; a record is unchanged if all of them are.
+RECORD_FIELDS = ('crscode', 'crsName', 'creditv', 'yearsem', 'semesterCourse', 'Degree', 'gradeN')
+
+class StudentProfile:
+    """A student's processed state that can absorb new portal exports incrementally.
+
+    update() diffs a new export against the previous one per course code, rebuilds
+    only the attempts of changed courses, and recomputes only the semesters they
+    touch. semesters, passed_courses and highest_level always match what
+    process_student_data would return for the latest export; semesters and
+    passed_courses are updated in place.
+    """
+
+    def __init__(self, curriculum, branch=None):
+        self.curriculum = curriculum
+        self.branch = branch
+        self.student_code = None
+        self.semesters = {}
+        self.passed_courses = set()
+        self.highest_level = 0
+        self.total_points = 0.0
+        self.total_hours = 0.0
+        self._records = {}         # code -> (record fingerprints, payload orders)
+        self._attempts = {}        # code -> [(order, attempt, semester_name, level_ord)]
+        self._counted = {}         # code -> attempt counted in the GPA
+        self._levels = {}          # code -> highest level ordinal among its attempts
+        self._semester_codes = {}  # semester_id -> codes with an attempt in it
+
+    @property
+    def cumulative_gpa(self):
+        return (self.total_points / self.total_hours) if self.total_hours > 0 else 0
+
+    def update(self, student_response):
+        """Applies a new export for this student and returns the ids of changed semesters."""
+        grouped = {}
+        codes = course_code_table(self.curriculum, self.branch)
+        for order, course in enumerate(student_response.get('studentProgress', [])):
+            code = codes.resolve(course.get('crscode', '|'))[0]
+            fingerprint = tuple(map(course.get, RECORD_FIELDS))
+            entry = grouped.get(code)
+            if entry is None:
+                entry = grouped[code] = ([], [], [])
+            entry[0].append(fingerprint)
+            entry[1].append(order)
+            entry[2].append(course)
+
+        # Build every changed course before touching state, so a bad record leaves it intact
+        rebuilt = {}
+        for code, (fingerprints, orders, courses) in grouped.items():
+            key = (fingerprints, orders)
+            if self._records.get(code) == key:
+                continue
+            attempts = []
+            for order, course in zip(orders, courses):
+                att = build_attempt(course, self.curriculum, self.branch, codes)
+                if att is not None:
+                    attempts.append((order, att, course.get('semesterCourse', '|').split('|')[1],
+                                     _course_level(att.course_info)))
+            rebuilt[code] = (key, attempts)
+        removed = [code for code in self._records if code not in grouped]
+
+        affected = set()
+        for code in removed:
+            affected.update(self._drop_course(code))
+            del self._records[code]
+        for code, (key, attempts) in rebuilt.items():
+            affected.update(self._drop_course(code))
+            self._records[code] = key
+            if attempts:
+                affected.update(self._add_course(code, attempts))
+
+        student_code = student_response.get('StudentCode', '')
+        if student_code != self.student_code:
+            self.student_code = student_code
+            affected.update(self.semesters)
+        for semester_id in affected:
+            self._recompute_semester(semester_id)
+        if rebuilt or removed:
+            self.highest_level = max(self._levels.values(), default=0)
+        return affected
+
+    def _drop_course(self, code):
+        """Forgets a course's attempts and returns the semesters they were in."""
+        attempts = self._attempts.pop(code, ())
+        self._counted.pop(code, None)
+        self._levels.pop(code, None)
+        self.passed_courses.discard(code)
+        semester_ids = {att.semester_id for _, att, _, _ in attempts}
+        for semester_id in semester_ids:
+            self._semester_codes[semester_id].discard(code)
+        return semester_ids
+
+    def _add_course(self, code, attempts):
+        """Registers a course's attempts and returns the semesters they are in."""
+        self._attempts[code] = attempts
+        counted = None
+        for _, att, _, level_ord in attempts:
+            if att.is_finished and att.status == 'Passed':
+                self.passed_courses.add(code)
+            if att.is_finished and not att.is_uni_course:
+                if counted is None or att.semester_id >= counted.semester_id:
+                    counted = att
+            if level_ord > 0:
+                self._levels[code] = max(self._levels.get(code, 0), level_ord)
+        if counted is not None:
+            self._counted[code] = counted
+        semester_ids = {att.semester_id for _, att, _, _ in attempts}
+        for semester_id in semester_ids:
+            self._semester_codes.setdefault(semester_id, set()).add(code)
+        return semester_ids
+
+    def _recompute_semester(self, semester_id):
+        """Rebuilds one semester from the attempts currently registered in it."""
+        old = self.semesters.get(semester_id)
+        if old is not None:
+            self.total_points -= old.total_points
+            self.total_hours -= old.total_hours
+        codes = self._semester_codes.get(semester_id)
+        if not codes:
+            self._semester_codes.pop(semester_id, None)
+            self.semesters.pop(semester_id, None)
+            return
+
+        entries = sorted(
+            (entry for code in codes for entry in self._attempts[code] if entry[1].semester_id == semester_id),
+            key=lambda entry: entry[0],
+        )
+        sem = Semester(entries[0][2])
+        sem.courses = [att for _, att, _, _ in entries if att.is_finished or not att.is_uni_course]
+        for _, _, _, level_ord in reversed(entries):
+            if level_ord > 0:
+                sem.year_str = academic_year(self.student_code, level_ord)
+                break
+        # Sum in first-seen course order, as process_student_data does
+        for code in sorted(codes, key=lambda c: self._records[c][1][0]):
+            att = self._counted.get(code)
+            if att is not None and att.semester_id == semester_id:
+                sem.total_points += att.grade_points * att.hours
+                sem.total_hours += att.hours
+
+        if old is not None:
+            # Keep the Semester object (and its dict position) that callers already hold
+            old.courses, old.total_points, old.total_hours = sem.courses, sem.total_points, sem.total_hours
+            old.year_str, old.semester_name = sem.year_str, sem.semester_name
+            sem = old
+        else:
+            self.semesters[semester_id] = sem
+        self.total_points += sem.total_points
+        self.total_hours += sem.total_hours
+
+def calculate_semester_gpa(semester_data):
+    """Returns the GPA for a single semester."""
+    return (semester_data.total_points / semester_data.total_hours) if semester_data.total_hours > 0 else 0
+
+def calculate_cumulative_gpa(semesters):
+    """Returns the cumulative GPA and total counted hours across all semesters."""
+    total_points = sum(s.total_points for s in semesters.values())
+    total_hours = sum(s.total_hours for s in semesters.values())
+    gpa = (total_points / total_hours) if total_hours > 0 else 0
+    return gpa, total_hours
+
+def sort_semesters(semesters):
+    """Returns (semester_id, Semester) pairs in chronological order."""
+    return sorted(semesters.items(), key=lambda x: x[0] if x[0] is not None else 0)
+
+def progress_summary(curriculum, passed_courses, graph=None):
+    """Computes credit-hour progress and the remaining courses with their prerequisite status."""
+    total_hours = sum(c['credit_hours'] for c in curriculum.values())
+    completed_hours = sum(curriculum[c]['credit_hours'] for c in passed_courses if c in curriculum)
+    graph = graph or PrerequisiteGraph(curriculum)
+    passed_mask = graph.mask(passed_courses)
+
+    remaining = []
+    remaining_courses = {code: data for code, data in curriculum.items() if code not in passed_courses}
+    for code, data in sorted(remaining_courses.items(), key=lambda item: (item[1]['level'], item[1]['semester'])):
+        eligible = graph.is_eligible(code, passed_mask)
+        remaining.append({
+            'code': code,
+            'name': data['name'],
+            'hours': data['credit_hours'],
+            'eligible': eligible,
+            'blocked_by': [] if eligible else graph.blocked_by(code, passed_mask),
+        })
+    return {
+        'total_hours': total_hours,
+        'completed_hours': completed_hours,
+        'remaining': remaining,
+        'estimated_semesters': graph.min_semesters(passed_mask, DEFAULT_CREDIT_HOUR_CAP) if remaining else 0,
+    }
+
+def load_curriculums(path='curriculums.json'):
+    """Loads all curricula from curriculums.json."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def flatten_se_curriculum(json_data):
+    """Flattens the nested Software Engineering curriculum JSON into a flat dict like the General curriculum.
+
+    Courses are keyed by their undashed code only; CourseCodeTable resolves the
+    dashed spellings the portal uses.
+    """
+    flat = {}
+    for level, semesters in json_data.items():
+        if not isinstance(semesters, dict):
+            continue
+        for semester, courses in semesters.items():
+            if not isinstance(courses, list):
+                continue
+            for course in courses:
+                code = course['code'].replace('-', '')
+                flat[code] = {
+                    'name': course['name'],
+                    'credit_hours': course.get('credit_hours', 3),
+                    'prerequisites': course.get('prerequisites', []),
+                    'level': course['level'],
+                    'semester': course['semester'],
+                    'track': course.get('type', 'General'),
+                    'type': course.get('type', 'General')
+                }
+    return flat
+
+def select_curriculum(curriculums, branch):
+    """Returns the flat curriculum dict for the given branch name."""
+    if branch == "Software Engineering":
+        return flatten_se_curriculum(curriculums["SoftwareEngineering"]["curriculum"])
+    return curriculums["General"]
+
+# --- Compiled Curriculum Cache ---
+CURRICULUMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Curriculums.json')
+CURRICULUM_CACHE_VERSION = 2
+CURRICULUM_BRANCHES = ("General", "Software Engineering")
+AUTO_BRANCH = "auto"
+
+def _curriculum_cache_path(cache_dir, branch):
+    return os.path.join(cache_dir, branch.lower().replace(' ', '_') + '.pickle')
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def compile_curriculums(source=CURRICULUMS_PATH, cache_dir=None):
+    """Parses and flattens every branch once and writes one cache file per branch.
+
+    Each file holds a small header (source mtime, size and hash) followed by the
+    flat curriculum, so a stale check never has to unpickle the curriculum itself.
+    Returns the flat curricula keyed by branch name.
+    """
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(source)), '__curriculum_cache__')
+    curriculums = load_curriculums(source)
+    stat = os.stat(source)
+    header = {
+        'version': CURRICULUM_CACHE_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': _file_sha256(source),
+    }
+    compiled = {branch: select_curriculum(curriculums, branch) for branch in CURRICULUM_BRANCHES}
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for branch, curriculum in compiled.items():
+            path = _curriculum_cache_path(cache_dir, branch)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(curriculum, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+    except OSError:
+        pass  # Read-only checkout: the parsed curricula are still usable without a cache
+    return compiled
+
+def load_branch_curriculum(branch, source=CURRICULUMS_PATH, cache_dir=None):
+    """Loads the flat curriculum for one branch, using the compiled cache when it is fresh.
+
+    The cache is trusted when the source mtime and size match; otherwise the source
+    hash decides whether the cache is still valid or the curricula must be recompiled.
+    """
+    if branch not in CURRICULUM_BRANCHES:
+        raise ValueError(f"Unknown branch: {branch!r}")
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(source)), '__curriculum_cache__')
+    path = _curriculum_cache_path(cache_dir, branch)
+    stat = os.stat(source)
+    try:
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            if header.get('version') == CURRICULUM_CACHE_VERSION:
+                if header['mtime_ns'] == stat.st_mtime_ns and header['size'] == stat.st_size:
+                    return pickle.load(f)
+                if header['sha256'] == _file_sha256(source):
+                    # Touched but unchanged (e.g. a fresh checkout): keep the cache
+                    return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, TypeError):
+        pass
+    return compile_curriculums(source, cache_dir)[branch]
+
+def read_export_student(file_path, profiler=DISABLED):
+    """Reads the first student of an export file, with 'studentProgress' as a list.
+
+    Returns (student_response, error).
+    """
+    if not os.path.exists(file_path):
+        return None, f"Error: '{file_path}' not found."
+    try:
+        with profiler.stage('parse'), closing(stream_student_file(file_path)) as students:
+            student_response = next(students, None)
+            if student_response is None:
+                return None, f"Error: No student data found in '{file_path}'."
+            if 'studentProgress' in student_response:
+                student_response['studentProgress'] = list(student_response['studentProgress'])
+            return student_response, None
+    except PortalStreamError:
+        return None, f"Error: Could not decode JSON in '{file_path}'."
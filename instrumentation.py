@@ -0,0 +1,99 @@
+"""Opt-in per-stage timing for the advisor.
+
+Set GPA_PROFILE=1 (or pass --profile) to time each stage of main(): curriculum
+load, payload parse, processing and every display call. Each stage records wall
+time and the net number of memory blocks it left allocated; when tracemalloc is
+running (PYTHONTRACEMALLOC=1) the stage's peak traced memory is recorded too. A
+JSON summary is written to stderr when the run ends, or to GPA_PROFILE_SUMMARY
+if that names a file. GPA_PROFILE_DUMP=<path> additionally runs the processing
+stage under cProfile and writes the stats there (view with `python -m pstats`).
+
+When disabled, stage() returns one shared no-op context manager, so instrumented
+code pays a method call per stage and nothing else.
+"""
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+PROFILED_STAGES = ('process',)
+
+_NULL_STAGE = nullcontext()
+
+class StageProfiler:
+    """Collects per-stage timings; a disabled profiler records nothing."""
+
+    def __init__(self, enabled=False, summary_path=None, dump_path=None):
+        self.enabled = enabled
+        self.summary_path = summary_path
+        self.dump_path = dump_path
+        self.stages = {}
+        self._cprofile = cProfile.Profile() if enabled and dump_path else None
+        self._start = time.perf_counter()
+
+    @classmethod
+    def from_env(cls, argv=None):
+        """Builds a profiler from GPA_PROFILE / --profile, GPA_PROFILE_SUMMARY and GPA_PROFILE_DUMP."""
+        argv = sys.argv[1:] if argv is None else argv
+        enabled = '--profile' in argv or os.getenv('GPA_PROFILE', '').lower() in ('1', 'true', 'yes')
+        return cls(enabled, os.getenv('GPA_PROFILE_SUMMARY') or None, os.getenv('GPA_PROFILE_DUMP') or None)
+
+    def stage(self, name):
+        """Context manager timing one run of the named stage."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        profiler = self._cprofile if name in PROFILED_STAGES else None
+        blocks_before = sys.getallocatedblocks()
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+            blocks = sys.getallocatedblocks() - blocks_before
+            entry = self.stages.setdefault(name, {'stage': name, 'calls': 0, 'seconds': 0.0,
+                                                  'allocated_blocks': 0})
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+            entry['allocated_blocks'] += blocks
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1] - traced_before
+                entry['peak_bytes'] = max(entry.get('peak_bytes', 0), peak)
+
+    def summary(self):
+        """Returns the recorded stages, in first-run order, as a JSON-serialisable dict."""
+        stages = [dict(entry, seconds=round(entry['seconds'], 6)) for entry in self.stages.values()]
+        return {
+            'total_seconds': round(time.perf_counter() - self._start, 6),
+            'stages': stages,
+            'profile_dump': self.dump_path if self._cprofile else None,
+        }
+
+    def report(self):
+        """Writes the summary (and the cProfile dump, if requested); no-op when disabled."""
+        if not self.enabled:
+            return
+        if self._cprofile:
+            self._cprofile.dump_stats(self.dump_path)
+        text = json.dumps(self.summary(), indent=2)
+        if self.summary_path:
+            with open(self.summary_path, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        else:
+            sys.stderr.write(text + '\n')
+
+DISABLED = StageProfiler()
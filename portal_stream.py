@@ -0,0 +1,149 @@
+"""Streaming ingestion for large student portal exports.
+
+A portal export is one JSON object with a 'studentProgress' array. Archive exports
+may hold many of them, either as a top-level JSON array, as concatenated objects,
+or as JSON Lines (one student per line). iter_student_responses walks all of
+these layouts incrementally: each student is yielded as a dict whose
+'studentProgress' value is a lazy iterator over the records, so only one chunk of
+the file and one record are held in memory at a time.
+"""
+import json
+
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789.eE+-'
+_decoder = json.JSONDecoder()
+
+class PortalStreamError(ValueError):
+    """Raised when an export is not valid JSON or not shaped like portal data."""
+
+class _Reader:
+    """A refillable text buffer over a file that decodes one JSON value at a time."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so the buffer never grows past one chunk plus one value
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it, or None at EOF."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return None
+
+    def expect(self, chars):
+        ch = self.peek()
+        if ch is None or ch not in chars:
+            found = 'end of input' if ch is None else repr(ch)
+            raise PortalStreamError(f"Invalid JSON: expected one of {chars!r}, found {found}.")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decodes the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise PortalStreamError(f"Invalid JSON: {exc.msg}.") from None
+            # A value at the very end of the buffer, or a number cut off mid-way ('3.' of
+            # '3.25'), may continue in the next chunk
+            if (end == len(self.buf) or isinstance(value, (int, float)) and self.buf[end] in _NUMBER_CHARS) \
+                    and self._fill():
+                continue
+            self.pos = end
+            return value
+
+def _iter_progress(reader, response):
+    """Yields studentProgress records, then stores the keys that follow the array."""
+    if reader.peek() == ']':
+        reader.pos += 1
+    else:
+        while True:
+            yield reader.value()
+            if reader.expect(',]') == ']':
+                break
+    while reader.expect(',}') == ',':
+        key = reader.value()
+        reader.expect(':')
+        response[key] = reader.value()
+
+def _stream_student(reader):
+    """Reads the keys before studentProgress and returns (response, records iterator)."""
+    reader.expect('{')
+    response = {}
+    if reader.peek() == '}':
+        reader.pos += 1
+        return response, iter(())
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise PortalStreamError("Invalid JSON: object keys must be strings.")
+        reader.expect(':')
+        if key == 'studentProgress' and reader.peek() == '[':
+            reader.pos += 1
+            records = _iter_progress(reader, response)
+            response['studentProgress'] = records
+            return response, records
+        response[key] = reader.value()
+        if reader.expect(',}') == '}':
+            return response, iter(())
+
+def iter_student_responses(f, chunk_size=CHUNK_SIZE):
+    """Yields one response dict per student found in an open text file.
+
+    Each response must be fully consumed (or abandoned) before asking for the next
+    one; any records left unread are skipped when the iterator advances.
+    Raises PortalStreamError on malformed input.
+    """
+    reader = _Reader(f, chunk_size)
+    while True:
+        ch = reader.peek()
+        if ch is None:
+            return
+        if ch == '[':
+            reader.pos += 1
+            if reader.peek() == ']':
+                reader.pos += 1
+                continue
+            while True:
+                response, records = _stream_student(reader)
+                yield response
+                for _ in records:
+                    pass
+                if reader.expect(',]') == ']':
+                    break
+        else:
+            response, records = _stream_student(reader)
+            yield response
+            for _ in records:
+                pass
+
+def stream_student_file(file_path):
+    """Yields every student response in an export file, streaming their records."""
+    # utf-8-sig tolerates the byte-order mark some editors add to Response.txt
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        yield from iter_student_responses(f)
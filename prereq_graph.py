@@ -0,0 +1,135 @@
+"""Prerequisite graph for a flat curriculum, with bitset prerequisite closure.
+
+Course codes are interned to integers in topological order, so every prerequisite
+has a lower index than the course that needs it. Sets of courses are plain Python
+ints used as bitsets, which makes "eligible now" and "blocked by" a few bitwise
+operations per course instead of re-walking prerequisite lists.
+"""
+DEFAULT_CREDIT_HOUR_CAP = 18
+
+def _bits(mask):
+    """Yields the indexes of the set bits in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class PrerequisiteGraph:
+    """Interned, topologically ordered prerequisite graph built once per curriculum."""
+
+    def __init__(self, curriculum):
+        # Curricula are keyed by canonical code only; CourseCodeTable resolves other spellings
+        requires = {code: list(data.get('prerequisites', [])) for code, data in curriculum.items()}
+        for prereqs in list(requires.values()):
+            for p in prereqs:
+                requires.setdefault(p, [])  # Prerequisites missing from the curriculum
+
+        self.codes = self._topological_order(requires)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+
+        self.hours = [0] * len(self.codes)
+        self.curriculum_mask = 0
+        for code, data in curriculum.items():
+            i = self.index[code]
+            self.hours[i] = data.get('credit_hours', 0)
+            self.curriculum_mask |= 1 << i
+
+        self.prereq_masks = []
+        self.closure_masks = []
+        for code in self.codes:
+            direct = closure = 0
+            for p in requires[code]:
+                j = self.index[p]
+                direct |= 1 << j
+                closure |= (1 << j) | self.closure_masks[j]
+            self.prereq_masks.append(direct)
+            self.closure_masks.append(closure)
+
+        # Longest chain of curriculum courses that depends on each course (itself included)
+        self.heights = [1] * len(self.codes)
+        for i in reversed(range(len(self.codes))):
+            for j in _bits(self.prereq_masks[i] & self.curriculum_mask):
+                self.heights[j] = max(self.heights[j], self.heights[i] + 1)
+
+    @staticmethod
+    def _topological_order(requires):
+        """Orders codes so prerequisites come first; ties are broken by code."""
+        pending = {code: len(set(prereqs)) for code, prereqs in requires.items()}
+        dependents = {code: [] for code in requires}
+        for code, prereqs in requires.items():
+            for p in set(prereqs):
+                dependents[p].append(code)
+        ready = sorted(code for code, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            code = ready.pop(0)
+            order.append(code)
+            for dependent in sorted(dependents[code]):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+            ready.sort()
+        if len(order) != len(requires):
+            cycle = sorted(code for code, count in pending.items() if count > 0)
+            raise ValueError(f"Prerequisite cycle among: {', '.join(cycle)}")
+        return order
+
+    def mask(self, codes):
+        """Returns the bitset for an iterable of course codes; unknown codes are ignored."""
+        if isinstance(codes, int):
+            return codes
+        result = 0
+        index = self.index
+        for code in codes:
+            i = index.get(code)
+            if i is not None:
+                result |= 1 << i
+        return result
+
+    def is_eligible(self, code, passed):
+        """True if every direct prerequisite of code is in passed (codes or a bitset)."""
+        return self.prereq_masks[self.index[code]] & ~self.mask(passed) == 0
+
+    def eligible(self, passed):
+        """Returns the codes of remaining courses that can be taken now."""
+        passed = self.mask(passed)
+        return [self.codes[i] for i in _bits(self.curriculum_mask & ~passed)
+                if self.prereq_masks[i] & ~passed == 0]
+
+    def blocked_by(self, code, passed):
+        """Returns every prerequisite, direct or transitive, of code not yet passed."""
+        missing = self.closure_masks[self.index[code]] & ~self.mask(passed)
+        return [self.codes[i] for i in _bits(missing)]
+
+    def remaining(self, passed):
+        """Returns the codes of curriculum courses not yet passed, in topological order."""
+        return [self.codes[i] for i in _bits(self.curriculum_mask & ~self.mask(passed))]
+
+    def remaining_hours(self, passed):
+        return sum(self.hours[i] for i in _bits(self.curriculum_mask & ~self.mask(passed)))
+
+    def min_semesters(self, passed, credit_cap=DEFAULT_CREDIT_HOUR_CAP):
+        """Estimates the semesters needed to finish the curriculum under a credit-hour cap.
+
+        Courses are scheduled greedily, longest dependent chain first, which is exact
+        whenever the cap is not the binding constraint and never below the true lower
+        bound max(longest chain, remaining hours / cap). Prerequisites that are not
+        part of the curriculum are treated as satisfied.
+        """
+        passed = self.mask(passed)
+        remaining = self.curriculum_mask & ~passed
+        done = passed | ~self.curriculum_mask
+        semesters = 0
+        while remaining:
+            available = sorted((i for i in _bits(remaining) if self.prereq_masks[i] & ~done == 0),
+                               key=lambda i: (-self.heights[i], i))
+            taken = load = 0
+            for i in available:
+                if taken and load + self.hours[i] > credit_cap:
+                    continue
+                taken |= 1 << i
+                load += self.hours[i]
+            done |= taken
+            remaining &= ~taken
+            semesters += 1
+        return semesters
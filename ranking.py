@@ -0,0 +1,156 @@
+"""Cohort ranking by cumulative GPA, per branch and intake year, maintained incrementally.
+
+GPAs are bucketed to 4 decimal places (the precision batch results report), so a
+cohort is a Fenwick tree of student counts over the 40,001 possible buckets
+between 0.0000 and 4.0000. Inserting, moving or removing a student and asking
+for their rank are O(log buckets) whatever the cohort size, and top-k walks
+down from the highest occupied bucket without ever sorting the cohort.
+
+Students with the same bucketed GPA share a rank (1 + the number of students
+strictly above them), and a percentile is the share of the cohort at or below
+a student's GPA.
+"""
+from gpa_core import intake_year
+
+GPA_SCALE = 10000
+MAX_GPA = 4.0
+
+def gpa_bucket(gpa):
+    """The tree slot for a GPA: the GPA in ten-thousandths, clamped to 0..MAX_GPA."""
+    return min(max(round(gpa * GPA_SCALE), 0), round(MAX_GPA * GPA_SCALE))
+
+class GpaRanking:
+    """Rank, percentile and top-k over one cohort's cumulative GPAs."""
+
+    def __init__(self):
+        self._slots = round(MAX_GPA * GPA_SCALE) + 1
+        self._tree = [0] * (self._slots + 1)  # Fenwick tree of counts, 1-based
+        self._buckets = {}                    # bucket -> {student: gpa}
+        self._students = {}                   # student -> bucket
+
+    def __len__(self):
+        return len(self._students)
+
+    def __contains__(self, student):
+        return student in self._students
+
+    def _add(self, bucket, delta):
+        i = bucket + 1
+        tree = self._tree
+        while i <= self._slots:
+            tree[i] += delta
+            i += i & -i
+
+    def _count_upto(self, bucket):
+        """Students in buckets 0..bucket."""
+        i = bucket + 1
+        total = 0
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _kth_bucket(self, k):
+        """The bucket holding the k-th lowest student (1-based)."""
+        pos = 0
+        step = 1 << self._slots.bit_length()
+        tree = self._tree
+        while step:
+            nxt = pos + step
+            if nxt <= self._slots and tree[nxt] < k:
+                pos = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return pos  # Fenwick index pos + 1, i.e. bucket pos
+
+    def update(self, student, gpa):
+        """Inserts a student or moves them to a new GPA."""
+        bucket = gpa_bucket(gpa)
+        old = self._students.get(student)
+        if old is not None:
+            if old == bucket:
+                self._buckets[bucket][student] = gpa
+                return
+            self.remove(student)
+        self._students[student] = bucket
+        self._buckets.setdefault(bucket, {})[student] = gpa
+        self._add(bucket, 1)
+
+    def remove(self, student):
+        """Removes a student; unknown students are ignored."""
+        bucket = self._students.pop(student, None)
+        if bucket is None:
+            return
+        members = self._buckets[bucket]
+        del members[student]
+        if not members:
+            del self._buckets[bucket]
+        self._add(bucket, -1)
+
+    def rank(self, student):
+        """1 + the number of students with a strictly higher GPA; KeyError if unknown."""
+        bucket = self._students[student]
+        return len(self._students) - self._count_upto(bucket) + 1
+
+    def percentile(self, student):
+        """Percentage of the cohort (the student included) at or below the student's GPA."""
+        bucket = self._students[student]
+        return 100.0 * self._count_upto(bucket) / len(self._students)
+
+    def top(self, k=10):
+        """Returns up to k (student, gpa, rank) tuples, best first; ties are ordered by student."""
+        result = []
+        above = 0
+        remaining = len(self._students)
+        while remaining > 0 and len(result) < k:
+            bucket = self._kth_bucket(remaining)
+            members = self._buckets[bucket]
+            for student in sorted(members):
+                if len(result) == k:
+                    break
+                result.append((student, members[student], above + 1))
+            above += len(members)
+            remaining -= len(members)
+        return result
+
+class RankingIndex:
+    """One GpaRanking per (branch, intake year), keyed by StudentCode."""
+
+    def __init__(self):
+        self.cohorts = {}
+        self._groups = {}  # student code -> (branch, intake year)
+
+    def update(self, student_code, branch, gpa):
+        """Inserts or updates a student and returns their (branch, intake year) group."""
+        group = (branch, intake_year(student_code))
+        old = self._groups.get(student_code)
+        if old is not None and old != group:
+            self.cohorts[old].remove(student_code)
+        self._groups[student_code] = group
+        cohort = self.cohorts.get(group)
+        if cohort is None:
+            cohort = self.cohorts[group] = GpaRanking()
+        cohort.update(student_code, gpa)
+        return group
+
+    def remove(self, student_code):
+        group = self._groups.pop(student_code, None)
+        if group is not None:
+            self.cohorts[group].remove(student_code)
+
+    def standing(self, student_code):
+        """Returns {'branch', 'intake_year', 'rank', 'cohort_size', 'percentile'} for a student."""
+        branch, year = group = self._groups[student_code]
+        cohort = self.cohorts[group]
+        return {
+            'branch': branch,
+            'intake_year': year,
+            'rank': cohort.rank(student_code),
+            'cohort_size': len(cohort),
+            'percentile': round(cohort.percentile(student_code), 2),
+        }
+
+    def top(self, branch, year, k=10):
+        cohort = self.cohorts.get((branch, year))
+        return cohort.top(k) if cohort else []
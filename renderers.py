@@ -0,0 +1,183 @@
+"""Report renderers: plain text, CSV, JSON, static HTML, and the interactive rich tables.
+
+Every renderer has the signature render(out, semesters, progress, title='') and
+streams the whole report (all semesters, cumulative GPA, degree progress) into a
+single text writer, so batch runs pay for one buffered write per student instead
+of building and printing a rich Table and Panel per semester. `progress` is the
+dict from gpa_core.progress_summary, or None to leave that section out.
+"""
+import csv
+import html
+import json
+
+from gpa_core import (
+    calculate_cumulative_gpa,
+    calculate_semester_gpa,
+    sort_semesters,
+)
+
+def _semester_title(sem):
+    return f"{sem.year_str} - {sem.semester_name}"
+
+def _sorted_courses(sem):
+    return sorted(sem.courses, key=lambda c: c.code)
+
+def render_text(out, semesters, progress, title=''):
+    """Plain fixed-width text, suitable for logs and terminals without colour."""
+    write = out.write
+    if title:
+        write(f"{title}\n{'=' * len(title)}\n\n")
+    row = "{:<40.40} {:<8} {:>5} {:>11} {:>6}  {}\n"
+    for _, sem in sort_semesters(semesters):
+        write(f"{_semester_title(sem)}\n")
+        write(row.format("Course Name", "Code", "Hours", "Degree", "Letter", "Status"))
+        for c in _sorted_courses(sem):
+            write(row.format(c.name, c.code, f"{c.hours:.1f}", str(c.degree), c.letter, c.status))
+        write(f"Semester GPA: {calculate_semester_gpa(sem):.2f}\n\n")
+    gpa, _ = calculate_cumulative_gpa(semesters)
+    write(f"Cumulative GPA: {gpa:.2f}\n")
+
+    if progress and progress['total_hours']:
+        total, completed = progress['total_hours'], progress['completed_hours']
+        write(f"\nCredit Hours: {completed} / {total} ({completed / total:.1%}) Completed\n")
+        write("Remaining Courses\n")
+        for r in progress['remaining']:
+            status = "Yes" if r['eligible'] else "No"
+            blocked = f"  (blocked by {', '.join(r['blocked_by'])})" if r['blocked_by'] else ""
+            write(f"  {r['code']:<8} {r['name']:<40.40} {r['hours']:>3}  {status}{blocked}\n")
+        if progress['remaining']:
+            write(f"Estimated semesters to graduate: {progress['estimated_semesters']}\n")
+
+CSV_FIELDS = ('record', 'semester_id', 'semester', 'code', 'name', 'hours',
+              'degree', 'letter', 'status', 'gpa', 'blocked_by')
+
+def render_csv(out, semesters, progress, title=''):
+    """One CSV table; the 'record' column is course, semester, cumulative or remaining."""
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(CSV_FIELDS)
+    for sem_id, sem in sort_semesters(semesters):
+        name = _semester_title(sem)
+        for c in _sorted_courses(sem):
+            writer.writerow(('course', sem_id, name, c.code, c.name, c.hours,
+                             c.degree, c.letter, c.status, '', ''))
+        writer.writerow(('semester', sem_id, name, '', '', sem.total_hours,
+                         '', '', '', f"{calculate_semester_gpa(sem):.4f}", ''))
+    gpa, total_hours = calculate_cumulative_gpa(semesters)
+    writer.writerow(('cumulative', '', '', '', '', total_hours, '', '', '', f"{gpa:.4f}", ''))
+    if progress:
+        for r in progress['remaining']:
+            writer.writerow(('remaining', '', '', r['code'], r['name'], r['hours'], '', '',
+                             'Eligible' if r['eligible'] else 'Blocked', '', ' '.join(r['blocked_by'])))
+
+def report_dict(semesters, progress, title=''):
+    """The report as plain JSON-serialisable data."""
+    gpa, total_hours = calculate_cumulative_gpa(semesters)
+    report = {
+        'title': title,
+        'cumulative_gpa': round(gpa, 4),
+        'total_hours': total_hours,
+        'semesters': [
+            {
+                'semester_id': sem_id,
+                'year': sem.year_str,
+                'name': sem.semester_name,
+                'gpa': round(calculate_semester_gpa(sem), 4),
+                'hours': sem.total_hours,
+                'courses': [
+                    {'code': c.code, 'name': c.name, 'hours': c.hours, 'degree': c.degree,
+                     'letter': c.letter, 'status': c.status}
+                    for c in _sorted_courses(sem)
+                ],
+            }
+            for sem_id, sem in sort_semesters(semesters)
+        ],
+    }
+    if progress:
+        report['progress'] = progress
+    return report
+
+def render_json(out, semesters, progress, title=''):
+    """Compact JSON; dumps() without indent uses the C encoder in one write."""
+    out.write(json.dumps(report_dict(semesters, progress, title), ensure_ascii=False))
+    out.write('\n')
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 2rem; color: #1f2937; }}
+table {{ border-collapse: collapse; margin-bottom: .5rem; }}
+th, td {{ border: 1px solid #d1d5db; padding: .25rem .6rem; text-align: left; }}
+th {{ background: #f3f4f6; }}
+.num {{ text-align: right; }}
+.Passed, .yes {{ color: #15803d; }}
+.Failed, .no {{ color: #b91c1c; }}
+.gpa {{ font-weight: bold; margin-bottom: 1.5rem; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+"""
+
+def render_html(out, semesters, progress, title=''):
+    """A single self-contained static HTML page."""
+    write = out.write
+    esc = html.escape
+    write(_HTML_HEAD.format(title=esc(title or "Academic Report")))
+    for _, sem in sort_semesters(semesters):
+        write(f"<h2>{esc(_semester_title(sem))}</h2>\n<table>\n<tr><th>Course Name</th><th>Code</th>"
+              "<th>Credit Hours</th><th>Numeric Degree</th><th>Letter Grade</th><th>Status</th></tr>\n")
+        for c in _sorted_courses(sem):
+            write(f"<tr><td>{esc(c.name)}</td><td>{esc(c.code)}</td><td class=\"num\">{c.hours:.1f}</td>"
+                  f"<td class=\"num\">{esc(str(c.degree))}</td><td>{esc(c.letter)}</td>"
+                  f"<td class=\"{esc(c.status.replace(' ', ''))}\">{esc(c.status)}</td></tr>\n")
+        write(f"</table>\n<p class=\"gpa\">Semester GPA: {calculate_semester_gpa(sem):.2f}</p>\n")
+    gpa, _ = calculate_cumulative_gpa(semesters)
+    write(f"<h2>Cumulative GPA: {gpa:.2f}</h2>\n")
+
+    if progress and progress['total_hours']:
+        total, completed = progress['total_hours'], progress['completed_hours']
+        write(f"<h2>Degree Progress</h2>\n<p>Credit Hours: {completed} / {total} "
+              f"({completed / total:.1%}) Completed</p>\n<table>\n<tr><th>Code</th><th>Course Name</th>"
+              "<th>Hours</th><th>Prerequisites Met?</th><th>Blocked By</th></tr>\n")
+        for r in progress['remaining']:
+            met = '<span class="yes">Yes</span>' if r['eligible'] else '<span class="no">No</span>'
+            write(f"<tr><td>{esc(r['code'])}</td><td>{esc(r['name'])}</td><td class=\"num\">{r['hours']}</td>"
+                  f"<td>{met}</td><td>{esc(', '.join(r['blocked_by']))}</td></tr>\n")
+        write("</table>\n")
+        if progress['remaining']:
+            write(f"<p>Estimated semesters to graduate: {progress['estimated_semesters']}</p>\n")
+    write("</body>\n</html>\n")
+
+def render_rich(out, semesters, progress, title=''):
+    """The colourful interactive tables, written through a rich Console on out."""
+    from rich.console import Console
+    from rich.panel import Panel
+    from gpa_calculator import display_all_semesters, display_cumulative_gpa, display_progress_tables
+
+    console = Console(file=out)
+    if title:
+        console.print(Panel(f"[bold cyan]{title}[/bold cyan]", border_style="green", expand=False))
+    display_all_semesters(console, semesters)
+    display_cumulative_gpa(console, semesters)
+    if progress:
+        display_progress_tables(console, progress)
+
+RENDERERS = {
+    'text': render_text,
+    'csv': render_csv,
+    'json': render_json,
+    'html': render_html,
+    'rich': render_rich,
+}
+FILE_EXTENSIONS = {'text': 'txt', 'csv': 'csv', 'json': 'json', 'html': 'html', 'rich': 'txt'}
+
+def render_report(fmt, out, semesters, progress, title=''):
+    """Renders a report with the named renderer; raises ValueError for unknown formats."""
+    try:
+        renderer = RENDERERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown report format: {fmt!r}") from None
+    renderer(out, semesters, progress, title)
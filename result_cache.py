@@ -0,0 +1,124 @@
+"""Persistent cache of graded students, so unchanged exports are not regraded.
+
+Entries live in one SQLite file and are keyed by payload_key: a SHA-256 over the
+student code, the studentProgress records (only the fields processing reads, in
+order), the branch, a fingerprint of the curriculum and RESULT_CACHE_VERSION.
+Any change to the data, the curriculum or the grading code therefore misses
+rather than serving a stale result.
+
+Values are the JSON results built from process_student_data (for batch mode, the
+per-student result and rendered report), not the Attempt objects themselves:
+rebuilding those costs about as much as processing the records again, while a
+small JSON document loads in a few microseconds. The cache is bounded by the
+total size of the stored values; the least recently used entries are evicted
+first. Several processes may share one cache file (batch workers each open
+their own ResultCache); SQLite's locking serialises the writes.
+"""
+import hashlib
+import json
+import marshal
+import sqlite3
+import time
+
+from gpa_core import RECORD_FIELDS
+
+# Bump whenever grading or the cached result layout changes
+RESULT_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+def curriculum_fingerprint(curriculum):
+    """A stable hash of a flat curriculum's contents."""
+    text = json.dumps(curriculum, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def payload_key(student_response, branch, curriculum_version, *extra):
+    """The cache key for one student; studentProgress must already be a list.
+
+    `extra` holds anything else the cached value depends on (e.g. a report format).
+    """
+    records = [tuple(map(course.get, RECORD_FIELDS)) for course in student_response.get('studentProgress') or ()]
+    h = hashlib.sha256(marshal.dumps((RESULT_CACHE_VERSION, str(branch), curriculum_version,
+                                      str(student_response.get('StudentCode', '')),
+                                      tuple(map(str, extra)))))
+    h.update(marshal.dumps(records))
+    return h.hexdigest()
+
+class ResultCache:
+    """Size-bounded LRU cache of JSON results in a SQLite file."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, key):
+        """Returns the cached value for key, or None."""
+        row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time_ns(), key))
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """Stores a JSON-serialisable value, then evicts least recently used entries beyond max_bytes."""
+        text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                         (key, text, size, time.time_ns()))
+            excess = conn.execute("SELECT TOTAL(size) FROM results").fetchone()[0] - self.max_bytes
+            if excess > 0:
+                evict = []
+                for old_key, old_size in conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+                    if excess <= 0:
+                        break
+                    evict.append((old_key,))
+                    excess -= old_size
+                conn.executemany("DELETE FROM results WHERE key = ?", evict)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self):
+        """Returns this instance's hit/miss counters and the size of the cache's contents."""
+        entries, size = self._conn.execute("SELECT COUNT(*), TOTAL(size) FROM results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+            'entries': entries,
+            'bytes': int(size),
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,212 @@
+"""Long-running local HTTP server that grades portal exports.
+
+Usage:
+    python server.py --port 8765 --workers 4
+    curl -X POST --data-binary @Response.txt "http://127.0.0.1:8765/grade?branch=General"
+
+Both curricula are loaded and flattened once and handed to a pool of worker
+processes, so a request only pays for parsing and processing its own payload.
+The asyncio front end does no CPU work itself: it reads requests, forwards the
+raw body to the pool, and writes back the JSON the worker already serialised,
+so many concurrent connections stay responsive while the pool is busy.
+
+Endpoints:
+    POST /grade?branch=<branch>   body: the portal JSON; responds with the report
+                                  (cumulative and per-semester GPA, degree progress).
+                                  branch=auto detects the branch from the records.
+    GET  /health                  liveness check
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from branch_detect import BranchIndex
+from gpa_core import (
+    AUTO_BRANCH,
+    CURRICULUM_BRANCHES,
+    CURRICULUMS_PATH,
+    load_branch_curriculum,
+    process_student_data,
+    progress_summary,
+)
+from prereq_graph import PrerequisiteGraph
+from renderers import report_dict
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+DEFAULT_PORT = 8765
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            411: 'Length Required', 413: 'Payload Too Large', 422: 'Unprocessable Entity',
+            500: 'Internal Server Error'}
+
+# Per-worker state, set once by _init_worker
+_curricula = {}
+_graphs = {}
+_branch_index = None
+
+def _init_worker(curricula):
+    global _branch_index
+    _curricula.update(curricula)
+    _branch_index = BranchIndex(curricula)
+    for branch, curriculum in curricula.items():
+        _graphs[branch] = PrerequisiteGraph(curriculum)
+
+def _error(status, message):
+    return status, json.dumps({'error': message}).encode('utf-8')
+
+def grade_request(body, branch):
+    """Grades one raw request body in a worker; returns (HTTP status, JSON bytes)."""
+    try:
+        student_response = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return _error(400, "Error: Invalid JSON format.")
+    if not isinstance(student_response, dict):
+        return _error(400, "Error: Expected a JSON object with 'studentProgress'.")
+    detection = None
+    try:
+        if branch == AUTO_BRANCH:
+            detection = _branch_index.detect(student_response)
+            branch = detection['branch']
+        curriculum = _curricula[branch]
+        semesters, passed, level, error = process_student_data(student_response, curriculum, branch)
+    except (AttributeError, KeyError, IndexError, TypeError, ValueError) as exc:
+        return _error(422, f"Error: Could not process student data: {exc}")
+    if error:
+        return _error(422, error)
+    report = report_dict(semesters, progress_summary(curriculum, passed, _graphs[branch]))
+    report.update(student_code=student_response.get('StudentCode', ''), branch=branch, highest_level=level)
+    if detection:
+        report['branch_confidence'] = detection['confidence']
+    del report['title']
+    return 200, json.dumps(report, ensure_ascii=False).encode('utf-8')
+
+class GradeServer:
+    """The asyncio HTTP front end over a process pool of graders."""
+
+    def __init__(self, curricula, workers=None):
+        self.branches = tuple(curricula)
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        initializer=_init_worker, initargs=(curricula,))
+        self.requests = 0
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    async def route(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == '/health':
+            if method != 'GET':
+                return _error(405, "Use GET for /health.")
+            return 200, json.dumps({'status': 'ok', 'branches': self.branches,
+                                    'requests': self.requests}).encode('utf-8')
+        if url.path != '/grade':
+            return _error(404, f"Unknown path: {url.path}")
+        if method != 'POST':
+            return _error(405, "Use POST for /grade.")
+        branch = parse_qs(url.query).get('branch', ["General"])[0]
+        if branch not in self.branches and branch != AUTO_BRANCH:
+            return _error(400, f"Unknown branch: {branch!r}. Expected one of: "
+                               f"{', '.join(self.branches + (AUTO_BRANCH,))}.")
+        self.requests += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, grade_request, body, branch)
+
+    async def handle(self, reader, writer):
+        """Serves HTTP/1.1 requests on one connection until it closes (keep-alive supported)."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break  # Client closed between requests
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self.respond(writer, *_error(400, "Malformed request line."), keep_alive=False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if 'transfer-encoding' in headers or length < 0:
+                    await self.respond(writer, *_error(411, "A valid Content-Length is required."), keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, *_error(413, "Request body too large."), keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                try:
+                    status, payload = await self.route(method, target, body)
+                except Exception as exc:  # A crashed worker must not take the connection loop down
+                    status, payload = _error(500, f"Error: {exc}")
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, payload, keep_alive=True):
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + payload
+        )
+        await writer.drain()
+
+async def serve(host, port, curricula, workers=None):
+    server = GradeServer(curricula, workers)
+    listener = await server.start(host, port)
+    print(f"Serving on http://{host}:{port} ({server.workers} workers)", flush=True)
+    try:
+        async with listener:
+            serving = asyncio.ensure_future(listener.serve_forever())
+            try:
+                # SIGTERM (e.g. from a process manager) stops serving like Ctrl+C does
+                asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+            except NotImplementedError:
+                pass  # Windows event loops have no signal handlers
+            try:
+                await serving
+            except asyncio.CancelledError:
+                pass
+    finally:
+        server.close()  # Shuts the worker pool down so no worker outlives the server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve GPA and degree progress reports over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument('--curriculums', default=CURRICULUMS_PATH, help="Path to Curriculums.json.")
+    args = parser.parse_args(argv)
+
+    curricula = {branch: load_branch_curriculum(branch, args.curriculums) for branch in CURRICULUM_BRANCHES}
+    try:
+        asyncio.run(serve(args.host, args.port, curricula, args.workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,204 @@
+"""What-if solver: the grades needed in the remaining courses to reach a target GPA.
+
+Every remaining curriculum course is assumed to be passed. A course graded with
+points p over h credit hours adds p * h to the cumulative totals, and a retake
+replaces the attempt that currently counts for that course. The plan minimises
+the total degree-hours (sum of minimum degree x hours) needed to reach the target.
+
+Enumerating letter combinations is exponential in the number of courses, so the
+search is a dynamic programme over credit-hour-weighted points. Courses with the
+same credit hours are interchangeable, so each hour group is solved once as a
+small "k identical courses" table, and the groups are then merged while keeping
+only Pareto-optimal (points, cost) states capped at the points needed.
+
+The programme's choices are the letter floors (and 100 when it earns more than
+the top floor). Under a scheme that interpolates points within a band, each
+planned course is then lowered to the smallest degree in its band that keeps
+the total at or above the points needed.
+"""
+import math
+from functools import reduce
+
+from gpa_core import PASSING_GRADE_FLOORS, grade_degrees
+from prereq_graph import PrerequisiteGraph
+
+def _counted_attempts(semesters):
+    """Returns the attempt that currently counts for the GPA, per course code."""
+    counted = {}
+    for semester_id, sem in semesters.items():
+        for att in sem.courses:
+            if att.is_finished and not att.is_uni_course:
+                current = counted.get(att.code)
+                if current is None or semester_id >= current.semester_id:
+                    counted[att.code] = att
+    return counted
+
+def _group_layers(count, options):
+    """Solves `count` identical courses: layers[j][points] = (min cost, option index)."""
+    layers = [{0: (0, None)}]
+    for _ in range(count):
+        current = {}
+        for total, (cost, _) in layers[-1].items():
+            for idx, (units, option_cost) in enumerate(options):
+                key = total + units
+                new_cost = cost + option_cost
+                best = current.get(key)
+                if best is None or new_cost < best[0]:
+                    current[key] = (new_cost, idx)
+        layers.append(current)
+    return layers
+
+def _pareto(states):
+    """Drops states that need more cost for no more points."""
+    kept = {}
+    best_cost = None
+    for total in sorted(states, reverse=True):
+        entry = states[total]
+        if best_cost is None or entry[0] < best_cost:
+            kept[total] = entry
+            best_cost = entry[0]
+    return kept
+
+def solve_target_gpa(semesters, curriculum, passed_courses, target, scheme="General", graph=None):
+    """Computes the cheapest grades in the remaining courses that reach a cumulative target GPA.
+
+    Returns a dict with the current standing, whether the target is feasible, the
+    lowest uniform degree that reaches it ('uniform_degree'), and a per-course
+    'plan' of minimum letter grades (empty if infeasible).
+    """
+    graph = graph or PrerequisiteGraph(curriculum)
+    remaining = [code for code in graph.remaining(passed_courses) if code in curriculum]
+
+    # Drop the counted attempts that passing a remaining course would replace
+    counted = _counted_attempts(semesters)
+    remaining_nodes = {graph.index[code] for code in remaining}
+    base_points = base_hours = 0.0
+    for code, att in counted.items():
+        if graph.index.get(code) not in remaining_nodes:
+            base_points += att.grade_points * att.hours
+            base_hours += att.hours
+    current_hours = sum(s.total_hours for s in semesters.values())
+    current_points = sum(s.total_points for s in semesters.values())
+
+    courses = []
+    for code in remaining:
+        hours = curriculum[code]['credit_hours']
+        if hours != int(hours):
+            raise ValueError(f"Fractional credit hours are not supported: {code} ({hours})")
+        courses.append((code, int(hours)))
+    remaining_hours = sum(h for _, h in courses)
+
+    floors = PASSING_GRADE_FLOORS[scheme]
+    letters, points = grade_degrees(floors + (100,), scheme)
+    if points[-1] > points[-2]:
+        floors += (100,)  # Interpolated points keep rising to 100 in the top band
+    else:
+        letters, points = letters[:-1], points[:-1]
+    total_hours = base_hours + remaining_hours
+    result = {
+        'target': target,
+        'scheme': scheme,
+        'current_gpa': (current_points / current_hours) if current_hours > 0 else 0,
+        'current_hours': current_hours,
+        'remaining_hours': remaining_hours,
+        'max_gpa': ((base_points + max(points) * remaining_hours) / total_hours) if total_hours > 0 else 0,
+        'feasible': False,
+        'uniform_degree': None,
+        'projected_gpa': None,
+        'plan': [],
+    }
+    if not courses:
+        result['feasible'] = result['current_gpa'] >= target
+        result['projected_gpa'] = result['current_gpa']
+        return result
+
+    needed = target * total_hours - base_points
+    # Lowest single degree that, scored in every remaining course, reaches the target
+    degrees = list(range(floors[0], 101))
+    _, uniform_points = grade_degrees(degrees, scheme)
+    for degree, pts in zip(degrees, uniform_points):
+        if pts * remaining_hours >= needed - 1e-9:
+            result['uniform_degree'] = degree
+            break
+
+    # Work in integer point units (hundredths divided by their common factor)
+    hundredths = [round(p * 100) for p in points]
+    unit = reduce(math.gcd, hundredths)
+    options = [(h // unit, degree) for h, degree in zip(hundredths, floors)]
+    need = max(0, math.ceil(needed * 100 / unit - 1e-9))
+    if need > max(u for u, _ in options) * remaining_hours:
+        return result
+
+    by_hours = {}
+    for code, hours in courses:
+        by_hours.setdefault(hours, []).append(code)
+    groups = []
+    for hours, codes in by_hours.items():
+        layers = _group_layers(len(codes), options)
+        groups.append((hours, codes, layers))
+    groups.sort(key=lambda g: len(g[2][-1]), reverse=True)
+
+    # Merge groups over weighted points, capped at `need`
+    states = {0: (0, None)}
+    history = []
+    for hours, _, layers in groups:
+        merged = {}
+        for total, (cost, _) in states.items():
+            for units, (group_cost, _) in layers[-1].items():
+                key = min(need, total + hours * units)
+                new_cost = cost + hours * group_cost
+                best = merged.get(key)
+                if best is None or new_cost < best[0]:
+                    merged[key] = (new_cost, (total, units))
+        states = _pareto(merged)
+        history.append(states)
+
+    # Walk the choices back to a letter grade per course
+    total = need
+    plan_units = 0
+    for (hours, codes, layers), step in zip(reversed(groups), reversed(history)):
+        prev_total, units = step[total][1]
+        total = prev_total
+        chosen = []
+        for j in range(len(codes), 0, -1):
+            idx = layers[j][units][1]
+            chosen.append(idx)
+            units -= options[idx][0]
+        chosen.sort(reverse=True)
+        for code, idx in zip(codes, chosen):
+            plan_units += hours * options[idx][0]
+            result['plan'].append({
+                'code': code,
+                'name': curriculum[code]['name'],
+                'hours': hours,
+                'letter': letters[idx],
+                'min_degree': floors[idx],
+                'points': points[idx],
+            })
+
+    # Spend the hundredths to spare lowering courses within their bands, highest degrees first
+    spare = plan_units * unit - max(0, math.ceil(needed * 100 - 1e-7))
+    bands = {}
+    for item in sorted(result['plan'], key=lambda item: (-item['min_degree'], -item['hours'])):
+        if spare <= 0:
+            break
+        idx = floors.index(item['min_degree'])
+        if idx == 0:
+            continue
+        if idx not in bands:
+            degrees = range(floors[idx - 1], floors[idx] + 1)
+            band_letters, band_points = grade_degrees(degrees, scheme)
+            bands[idx] = list(zip(degrees, band_letters, band_points))
+        floor_hundredths = hundredths[idx] * item['hours']
+        for degree, letter, pts in bands[idx]:
+            lost = floor_hundredths - round(pts * 100) * item['hours']
+            if lost <= spare:
+                spare -= lost
+                item.update(letter=letter, min_degree=degree, points=pts)
+                break
+
+    order = {code: i for i, code in enumerate(remaining)}
+    result['plan'].sort(key=lambda item: order[item['code']])
+    result['feasible'] = True
+    result['projected_gpa'] = (base_points + sum(item['points'] * item['hours'] for item in result['plan'])) / total_hours
+    return result
@@ -0,0 +1,45 @@
+import json
+
+from gpa_core import (
+    calculate_cumulative_gpa,
+    load_branch_curriculum,
+    process_export_file,
+    process_student_data,
+    read_export_student,
+)
+from portal_stream import CHUNK_SIZE
+
+def large_export(tmp_path, branch="General"):
+    """An export padded well past one read chunk, so its records span several reads."""
+    curriculum = load_branch_curriculum(branch)
+    progress = []
+    for i, (code, data) in enumerate(sorted(curriculum.items())):
+        term = i % 2
+        progress.append({
+            'crscode': f"{code}|{1000 + i}",
+            'crsName': f"|{data.get('name', '')}",
+            'creditv': str(data.get('credit_hours', 3)),
+            'yearsem': 20211 + term,
+            'semesterCourse': f"{term + 1}|{('First', 'Second')[term]} Semester",
+            'Degree': str(40 + i % 61),
+            'gradeN': '',
+        })
+    payload = {'StudentCode': '21001', 'studentProgress': progress * 40, 'Padding': 'x' * (3 * CHUNK_SIZE)}
+    path = tmp_path / 'Response.txt'
+    path.write_text(json.dumps(payload), encoding='utf-8')
+    assert path.stat().st_size > 2 * CHUNK_SIZE
+    return str(path), payload, curriculum
+
+def test_process_export_file_reads_records_past_the_first_chunk(tmp_path):
+    path, payload, curriculum = large_export(tmp_path)
+    semesters, passed, level, error = process_export_file(path, curriculum, "General")
+    assert error is None
+    expected = process_student_data(payload, curriculum, "General")
+    assert calculate_cumulative_gpa(semesters) == calculate_cumulative_gpa(expected[0])
+    assert passed == expected[1] and level == expected[2]
+
+def test_read_export_student_lists_every_record(tmp_path):
+    path, payload, _ = large_export(tmp_path)
+    student_response, error = read_export_student(path)
+    assert error is None
+    assert student_response['studentProgress'] == payload['studentProgress']
@@ -0,0 +1,70 @@
+import math
+
+import pytest
+
+from gpa_core import (
+    GENERAL_GRADE_CUTOFFS,
+    SOFTWARE_ENG_GPA_MAP,
+    get_grade_info,
+    get_grade_info_software_eng,
+    grade_degrees,
+)
+
+# The grading functions as they were before the breakpoint tables, kept as the reference.
+
+def reference_general(degree):
+    try:
+        score = float(degree)
+    except (ValueError, TypeError):
+        return {'letter': 'N/A', 'points': 0.0}
+    if score >= 96: return {'letter': 'A+', 'points': 4.0}
+    if score >= 92: return {'letter': 'A', 'points': 3.7}
+    if score >= 88: return {'letter': 'A-', 'points': 3.4}
+    if score >= 84: return {'letter': 'B+', 'points': 3.2}
+    if score >= 80: return {'letter': 'B', 'points': 3.0}
+    if score >= 76: return {'letter': 'B-', 'points': 2.8}
+    if score >= 72: return {'letter': 'C+', 'points': 2.6}
+    if score >= 68: return {'letter': 'C', 'points': 2.4}
+    if score >= 64: return {'letter': 'C-', 'points': 2.2}
+    if score >= 60: return {'letter': 'D+', 'points': 2.0}
+    if score >= 55: return {'letter': 'D', 'points': 1.5}
+    if score >= 50: return {'letter': 'D-', 'points': 1.0}
+    return {'letter': 'F', 'points': 0.0}
+
+def reference_software_eng(degree):
+    try:
+        score = float(degree)
+    except (ValueError, TypeError):
+        return {'letter': 'N/A', 'points': 0.0}
+    for lower, upper, gpa_min, gpa_max, letter in SOFTWARE_ENG_GPA_MAP:
+        if lower <= score < upper or (upper == 100 and score == 100):
+            if gpa_min == gpa_max:
+                gpa = gpa_min
+            else:
+                gpa = gpa_min + (gpa_max - gpa_min) * (score - lower) / (upper - lower)
+            return {'letter': letter, 'points': round(gpa, 2)}
+    return {'letter': 'F', 'points': 0.0}
+
+EDGES = sorted({*GENERAL_GRADE_CUTOFFS, *(band[0] for band in SOFTWARE_ENG_GPA_MAP), 95, 100})
+DEGREES = (
+    [edge + delta for edge in EDGES for delta in (-1, -1e-9, 0, 1e-9, 0.5)]
+    + [step / 4 for step in range(-8, 441)]
+    + [100.5, 101, 150, -0.0, -1, -50.5, 1e300, -1e300,
+       math.nan, math.inf, -math.inf]
+)
+INPUTS = DEGREES + [str(d) for d in (0, 49.9, 50, 95, 99.99, 100, 100.01)] + [
+    '', ' 88 ', 'abc', 'nan', 'inf', '-inf', None, [], {}, object(), True, False]
+
+@pytest.mark.parametrize('scheme, grade, reference', [
+    ("General", get_grade_info, reference_general),
+    ("Software Engineering", get_grade_info_software_eng, reference_software_eng),
+])
+def test_matches_the_reference_grading(scheme, grade, reference):
+    expected = [reference(degree) for degree in INPUTS]
+    assert [grade(degree) for degree in INPUTS] == expected
+    letters, points = grade_degrees(INPUTS, scheme)
+    assert [{'letter': letter, 'points': pts} for letter, pts in zip(letters, points)] == expected
+
+def test_unknown_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        grade_degrees([90], "Medicine")
@@ -0,0 +1,44 @@
+import io
+import json
+
+import pytest
+
+from portal_stream import PortalStreamError, iter_student_responses
+
+EXPORT = {
+    "StudentCode": "21001",
+    "CGPA": 3.25,
+    "Credits": 120,
+    "Ratio": -1.5e-3,
+    "studentProgress": [
+        {"crscode": "CSD101|x", "Degree": 87.5, "creditv": 3},
+        {"crscode": "BSD103|y", "Degree": 4e1, "creditv": 2},
+    ],
+    "Total": 0.125,
+}
+
+def read_all(text, chunk_size):
+    students = []
+    for response in iter_student_responses(io.StringIO(text), chunk_size):
+        response['studentProgress'] = list(response.get('studentProgress', ()))
+        students.append(response)
+    return students
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 4, 8, 16])
+def test_chunk_boundary_at_every_offset(chunk_size):
+    """Every value, numbers included, decodes the same wherever a chunk ends."""
+    text = json.dumps(EXPORT)
+    for pad in range(chunk_size):
+        assert read_all(' ' * pad + text, chunk_size) == [EXPORT]
+
+@pytest.mark.parametrize('chunk_size', [2, 4, 8])
+def test_archive_layouts(chunk_size):
+    array = json.dumps([EXPORT, EXPORT])
+    lines = json.dumps(EXPORT) + '\n' + json.dumps(EXPORT) + '\n'
+    for pad in range(chunk_size):
+        assert read_all(' ' * pad + array, chunk_size) == [EXPORT, EXPORT]
+        assert read_all(' ' * pad + lines, chunk_size) == [EXPORT, EXPORT]
+
+def test_malformed_number_is_rejected():
+    with pytest.raises(PortalStreamError):
+        read_all('{"CGPA": 3.x, "studentProgress": []}', 4)
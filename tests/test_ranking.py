@@ -0,0 +1,56 @@
+import random
+
+from ranking import GpaRanking, RankingIndex, gpa_bucket
+
+def brute_force_top(gpas, k):
+    """Top k (student, gpa, rank) by sorting the whole cohort, ties ordered by student."""
+    ordered = sorted(gpas.items(), key=lambda item: (-gpa_bucket(item[1]), item[0]))
+    return [(student, gpa, 1 + sum(gpa_bucket(g) > gpa_bucket(gpa) for g in gpas.values()))
+            for student, gpa in ordered[:k]]
+
+def test_tied_students_share_a_rank():
+    ranking = GpaRanking()
+    for student, gpa in [('s1', 3.5), ('s2', 3.9), ('s3', 3.5), ('s4', 3.50001), ('s5', 2.0)]:
+        ranking.update(student, gpa)
+    # 3.5 and 3.50001 fall in the same bucket, so s1, s3 and s4 tie behind s2
+    assert [ranking.rank(s) for s in ('s1', 's2', 's3', 's4', 's5')] == [2, 1, 2, 2, 5]
+    assert ranking.top(3) == [('s2', 3.9, 1), ('s1', 3.5, 2), ('s3', 3.5, 2)]
+    assert ranking.top(10)[-1] == ('s5', 2.0, 5)
+    assert ranking.percentile('s5') == 20.0 and ranking.percentile('s1') == 80.0
+
+    ranking.update('s2', 3.5)  # Moves into the tied bucket
+    assert ranking.top(2) == [('s1', 3.5, 1), ('s2', 3.5, 1)]
+    ranking.remove('s1')
+    ranking.remove('unknown')
+    assert len(ranking) == 4 and 's1' not in ranking
+    assert [entry[0] for entry in ranking.top(10)] == ['s2', 's3', 's4', 's5']
+
+def test_kth_bucket_and_top_match_a_sort():
+    rng = random.Random(17)
+    ranking = GpaRanking()
+    gpas = {}
+    for i in range(300):
+        student = f"s{rng.randrange(200):03d}"
+        if rng.random() < 0.1:
+            ranking.remove(student)
+            gpas.pop(student, None)
+            continue
+        gpas[student] = rng.choice((0.0, 4.0, 2.5, round(rng.uniform(0, 4), 2), rng.uniform(-1, 5)))
+        ranking.update(student, gpas[student])
+
+    buckets = sorted(gpa_bucket(gpa) for gpa in gpas.values())
+    assert [ranking._kth_bucket(k) for k in range(1, len(buckets) + 1)] == buckets
+    for k in (1, 5, 17, len(gpas), len(gpas) + 5):
+        assert ranking.top(k) == brute_force_top(gpas, k)
+    ranks = {student: rank for student, _, rank in brute_force_top(gpas, len(gpas))}
+    assert {student: ranking.rank(student) for student in gpas} == ranks
+
+def test_index_moves_students_between_cohorts():
+    index = RankingIndex()
+    index.update('21001', 'General', 3.0)
+    index.update('21002', 'General', 3.2)
+    assert index.standing('21001')['rank'] == 2
+    index.update('21001', 'Software Engineering', 3.0)
+    assert index.standing('21001') == {'branch': 'Software Engineering', 'intake_year': 2021,
+                                       'rank': 1, 'cohort_size': 1, 'percentile': 100.0}
+    assert index.top('General', 2021) == [('21002', 3.2, 1)]
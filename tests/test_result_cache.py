@@ -0,0 +1,32 @@
+from result_cache import ResultCache
+
+def value(size):
+    """A JSON value whose serialised form is exactly `size` bytes."""
+    return 'x' * (size - 2)
+
+def keys(cache):
+    return {key for key, in cache._conn.execute("SELECT key FROM results")}
+
+def test_put_evicts_least_recently_used_within_the_size_bound(tmp_path):
+    with ResultCache(str(tmp_path / 'cache.sqlite'), max_bytes=350) as cache:
+        for key in 'abc':
+            cache.put(key, value(100))
+        assert cache.get('a') == value(100)  # a is now more recent than b and c
+        cache.put('d', value(100))
+        assert keys(cache) == {'a', 'c', 'd'}
+
+        cache.put('e', value(200))  # Needs two evictions: c, then a
+        assert keys(cache) == {'d', 'e'}
+        assert cache.stats()['bytes'] == 300 <= cache.max_bytes
+
+        cache.put('d', value(150))  # Replacing an entry counts its new size only
+        assert keys(cache) == {'d', 'e'}
+        assert cache.stats()['bytes'] == 350
+
+def test_values_larger_than_the_cache_are_not_stored(tmp_path):
+    with ResultCache(str(tmp_path / 'cache.sqlite'), max_bytes=350) as cache:
+        cache.put('a', value(100))
+        cache.put('big', value(351))
+        assert keys(cache) == {'a'}
+        assert cache.get('big') is None
+        assert cache.stats()['misses'] == 1
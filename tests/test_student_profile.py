@@ -0,0 +1,63 @@
+import copy
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from gpa_core import (  # noqa: E402
+    CURRICULUM_BRANCHES,
+    StudentProfile,
+    calculate_cumulative_gpa,
+    load_branch_curriculum,
+    process_student_data,
+)
+from synthetic import synthetic_student  # noqa: E402
+
+def snapshot(semesters):
+    """Everything a report shows about the semesters, in display order."""
+    return {
+        semester_id: (sem.semester_name, sem.year_str, sem.total_points, sem.total_hours,
+                      [tuple(getattr(att, slot) for slot in att.__slots__) for att in sem.courses])
+        for semester_id, sem in semesters.items()
+    }
+
+def assert_matches_fresh(profile, payload, curriculum, branch):
+    semesters, passed, level, error = process_student_data(copy.deepcopy(payload), curriculum, branch)
+    assert error is None
+    assert snapshot(profile.semesters) == snapshot(semesters)
+    assert profile.passed_courses == passed
+    assert profile.highest_level == level
+    assert profile.cumulative_gpa == pytest.approx(calculate_cumulative_gpa(semesters)[0], abs=1e-12)
+
+def edits(payload, other, rng):
+    """A sequence of re-exports of the same student, ending with a different student."""
+    records = payload['studentProgress']
+    yield payload
+    yield dict(payload, studentProgress=records[:len(records) // 2])
+    edited = copy.deepcopy(records)
+    for record in rng.sample(edited, 5):
+        record['Degree'] = str(rng.randint(30, 100))
+        record['gradeN'] = ''
+    yield dict(payload, studentProgress=edited)
+    yield dict(payload, studentProgress=edited + rng.sample(edited, 3))
+    shuffled = list(edited)
+    rng.shuffle(shuffled)
+    yield dict(payload, studentProgress=shuffled)
+    yield dict(payload, studentProgress=[r for i, r in enumerate(shuffled) if i % 4])
+    yield other
+    yield payload
+
+@pytest.mark.parametrize('branch', CURRICULUM_BRANCHES)
+def test_incremental_updates_match_a_fresh_run(branch):
+    curriculum = load_branch_curriculum(branch)
+    rng = random.Random(branch)
+    for student in range(5):
+        payload = synthetic_student(curriculum, branch, student, terms=8)
+        other = synthetic_student(curriculum, branch, student + 100, terms=6)
+        profile = StudentProfile(curriculum, branch)
+        for export in edits(payload, other, rng):
+            profile.update(copy.deepcopy(export))
+            assert_matches_fresh(profile, export, curriculum, branch)
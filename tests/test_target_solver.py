@@ -0,0 +1,31 @@
+import time
+
+from gpa_core import load_branch_curriculum, process_student_data
+from target_solver import solve_target_gpa
+
+BRANCH = "Software Engineering"
+
+def test_interpolating_scheme_plans_exact_minimum_degrees():
+    """One course left at a 3.82 average needs 97, not the next letter floor (100)."""
+    curriculum = load_branch_curriculum(BRANCH)
+    records = [
+        {'crscode': f"{code}|", 'creditv': data['credit_hours'], 'yearsem': '20211',
+         'semesterCourse': '1|First Semester', 'Degree': '97'}
+        for code, data in curriculum.items() if code != 'CSC102'
+    ]
+    semesters, passed, _, error = process_student_data({'studentProgress': records}, curriculum, BRANCH)
+    assert error is None
+    result = solve_target_gpa(semesters, curriculum, passed, 3.82, BRANCH)
+    assert result['uniform_degree'] == 97
+    assert [(item['code'], item['min_degree']) for item in result['plan']] == [('CSC102', 97)]
+
+def test_fresh_transcript_solves_in_well_under_a_second():
+    """The menu runs the solver synchronously, so a whole curriculum must stay sub-second."""
+    curriculum = load_branch_curriculum(BRANCH)
+    semesters, passed, _, _ = process_student_data({'studentProgress': []}, curriculum, BRANCH)
+    start = time.perf_counter()
+    result = solve_target_gpa(semesters, curriculum, passed, 3.5, BRANCH)
+    elapsed = time.perf_counter() - start
+    assert result['feasible'] and result['projected_gpa'] >= 3.5
+    assert len(result['plan']) == len(curriculum)
+    assert elapsed < 1.0
@@ -0,0 +1,202 @@
+"""Watch mode: regrades a student whenever their export file appears or changes.
+
+Usage:
+    python watch.py Response.txt --branch General
+    python watch.py drop/ --branch "Software Engineering" --report html --out reports/
+
+The target (one export file, or a directory of them) is polled for changes in
+modification time and size; no extra dependencies are needed. A change is only
+processed once the file has stopped changing for --debounce seconds, so an
+editor or copy that writes in several steps triggers one update. The curriculum,
+its prerequisite graph and a StudentProfile per file stay in memory, so an event
+re-grades only that student and only the courses whose records changed.
+A RankingIndex of every watched student is kept up to date alongside, so each
+event also carries the student's rank and percentile by cumulative GPA within
+their intake year.
+
+Each event is printed as one JSON line (for a dashboard to consume), with
+'latency_ms' for parsing, grading and writing the report, and 'since_change_ms'
+from the file's last write to the refreshed report.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from contextlib import closing
+
+from batch import EXPORT_EXTENSIONS
+from gpa_core import (
+    CURRICULUM_BRANCHES,
+    CURRICULUMS_PATH,
+    StudentProfile,
+    load_branch_curriculum,
+    progress_summary,
+)
+from portal_stream import PortalStreamError, stream_student_file
+from prereq_graph import PrerequisiteGraph
+from ranking import RankingIndex
+from renderers import FILE_EXTENSIONS, RENDERERS, render_report
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_INTERVAL = 0.2
+
+class Watcher:
+    """Polls an export file or drop directory and regrades the files that changed."""
+
+    def __init__(self, target, curriculum, branch, report_format='json', out_dir='watch_reports',
+                 debounce=DEFAULT_DEBOUNCE):
+        self.target = target
+        self.curriculum = curriculum
+        self.branch = branch
+        self.report_format = report_format
+        self.out_dir = out_dir
+        self.debounce = debounce
+        self.graph = PrerequisiteGraph(curriculum)
+        self.profiles = {}  # path -> StudentProfile
+        self.seen = {}      # path -> (mtime_ns, size) last processed
+        self.pending = {}   # path -> ((mtime_ns, size), monotonic time it was first seen)
+        self.rankings = RankingIndex()
+
+    def scan(self):
+        """Returns {path: (mtime_ns, size)} for every watched export that exists now."""
+        if not os.path.isdir(self.target):
+            try:
+                stat = os.stat(self.target)
+            except OSError:
+                return {}
+            return {self.target: (stat.st_mtime_ns, stat.st_size)}
+        found = {}
+        with os.scandir(self.target) as entries:
+            for entry in entries:
+                # Skip our own reports, in case they are written into the drop directory
+                if entry.name.lower().endswith(EXPORT_EXTENSIONS) and '.report.' not in entry.name \
+                        and entry.is_file():
+                    stat = entry.stat()
+                    found[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def poll(self, now=None):
+        """Scans once and returns the events for files that settled since the last poll."""
+        now = time.monotonic() if now is None else now
+        current = self.scan()
+        events = [self._remove(path) for path in list(self.seen) if path not in current]
+        for path in list(self.pending):
+            if path not in current:
+                del self.pending[path]
+
+        for path, signature in current.items():
+            if self.seen.get(path) == signature:
+                self.pending.pop(path, None)
+                continue
+            pending = self.pending.get(path)
+            if pending is None or pending[0] != signature:
+                self.pending[path] = (signature, now)  # New or still being written: (re)start the wait
+            elif now - pending[1] >= self.debounce:
+                del self.pending[path]
+                events.append(self._process(path, signature))
+        return events
+
+    def _report_path(self, path):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.out_dir, f"{stem}.report.{FILE_EXTENSIONS[self.report_format]}")
+
+    def _process(self, path, signature):
+        start = time.perf_counter()
+        # Mark it seen even on failure, so a broken file is retried only once it changes again
+        self.seen[path] = signature
+        profile = self.profiles.get(path) or StudentProfile(self.curriculum, self.branch)
+        previous_code = profile.student_code
+        try:
+            with closing(stream_student_file(path)) as students:
+                student_response = next(students, None)
+                if student_response is None:
+                    return {'event': 'error', 'file': path, 'error': f"Error: No student data found in '{path}'."}
+                changed = profile.update(student_response)
+        except OSError as exc:
+            return {'event': 'error', 'file': path, 'error': f"Error: Could not read '{path}': {exc.strerror}"}
+        except PortalStreamError as exc:
+            return {'event': 'error', 'file': path, 'error': f"Error: Could not decode JSON in '{path}': {exc}"}
+        except (AttributeError, KeyError, IndexError, TypeError, ValueError) as exc:
+            return {'event': 'error', 'file': path, 'error': f"Error: Could not process student data: {exc}"}
+        self.profiles[path] = profile
+        if previous_code and previous_code != profile.student_code:
+            self.rankings.remove(previous_code)  # The file now holds a different student
+        ranked = profile.student_code and profile.total_hours > 0
+        if ranked:
+            self.rankings.update(profile.student_code, self.branch, profile.cumulative_gpa)
+        else:
+            self.rankings.remove(profile.student_code)
+
+        if self.out_dir:
+            buffer = io.StringIO()
+            render_report(self.report_format, buffer, profile.semesters,
+                          progress_summary(self.curriculum, profile.passed_courses, self.graph),
+                          f"Academic Report {profile.student_code or ''}".strip())
+            report_path = self._report_path(path)
+            tmp_path = f"{report_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(buffer.getvalue())
+            os.replace(tmp_path, report_path)  # Readers never see a half-written report
+
+        event = {
+            'event': 'updated',
+            'file': path,
+            'student_code': profile.student_code,
+            'cumulative_gpa': round(profile.cumulative_gpa, 4),
+            'total_hours': profile.total_hours,
+            'semesters_changed': len(changed),
+        }
+        if ranked:
+            standing = self.rankings.standing(profile.student_code)
+            event.update(intake_year=standing['intake_year'], rank=standing['rank'],
+                         cohort_size=standing['cohort_size'], percentile=standing['percentile'])
+        event['latency_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        event['since_change_ms'] = round((time.time_ns() - signature[0]) / 1e6, 3)
+        return event
+
+    def _remove(self, path):
+        del self.seen[path]
+        profile = self.profiles.pop(path, None)
+        if profile is not None:
+            self.rankings.remove(profile.student_code)
+        if self.out_dir:
+            try:
+                os.remove(self._report_path(path))
+            except OSError:
+                pass
+        return {'event': 'removed', 'file': path}
+
+    def run(self, interval=DEFAULT_INTERVAL, out=sys.stdout):
+        """Polls forever, writing one JSON line per event to out."""
+        while True:
+            for event in self.poll():
+                out.write(json.dumps(event, ensure_ascii=False) + '\n')
+            out.flush()
+            time.sleep(interval)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regrade students whenever their exports change.")
+    parser.add_argument('target', nargs='?', default='Response.txt', help="Export file or drop directory.")
+    parser.add_argument('--branch', choices=CURRICULUM_BRANCHES, default="General")
+    parser.add_argument('--curriculums', default=CURRICULUMS_PATH, help="Path to Curriculums.json.")
+    parser.add_argument('--report', choices=sorted(RENDERERS), default='json', help="Report format.")
+    parser.add_argument('--out', default='watch_reports', help="Directory for the refreshed reports.")
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help="Seconds a file must stay unchanged before it is processed.")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help="Seconds between scans.")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    curriculum = load_branch_curriculum(args.branch, args.curriculums)
+    watcher = Watcher(args.target, curriculum, args.branch, args.report, args.out, args.debounce)
+    print(f"Watching {args.target} (Ctrl+C to stop).", file=sys.stderr)
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())